@@ -0,0 +1,216 @@
+"""Headless batch detection over video files and image folders.
+
+    python batch_detect.py session1.mp4 session2.mp4 photos/ -o labels.jsonl
+    python batch_detect.py recordings/*.mp4 -o labels.csv --processes 4 --stride 2
+
+Writes one record per processed frame (or image): source, frame index,
+timestamp in ms, label and confidence, with label empty/null when no hand
+was found. Output format follows the extension: .jsonl or .csv.
+
+Decoding runs on a background thread so the detector never waits on I/O,
+and nothing is drawn. Videos go through Detector.predict frame by frame
+(tracking and smoothing apply); image folders are classified in batches via
+Detector.predict_batch. `--processes N` spreads the inputs over N worker
+processes, each with its own Detector; records are still written in input
+order.
+"""
+import os
+os.environ['KERAS_BACKEND'] = 'jax'
+
+import warnings
+warnings.filterwarnings('ignore')
+
+import argparse
+import csv
+import json
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing import Pool
+
+import cv2
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+FIELDS = ['source', 'frame', 'time_ms', 'label', 'confidence']
+
+
+def iter_video(path, stride=1):
+    """Yield (frame_index, time_ms, frame_bgr) for every `stride`-th frame."""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open video {path}")
+    try:
+        index = 0
+        while True:
+            if index % stride:
+                ok = cap.grab()
+            else:
+                ok, frame = cap.read()
+                if ok:
+                    yield index, cap.get(cv2.CAP_PROP_POS_MSEC), frame
+            if not ok:
+                break
+            index += 1
+    finally:
+        cap.release()
+
+
+def iter_images(path, stride=1):
+    """Yield (index, relative_name, frame_bgr) for images under `path`, sorted."""
+    files = sorted(os.path.join(root, f) for root, _, names in os.walk(path)
+                   for f in names if f.lower().endswith(IMAGE_EXTENSIONS))
+    for index in range(0, len(files), stride):
+        file = files[index]
+        frame = cv2.imread(file)
+        if frame is not None:
+            yield index, os.path.relpath(file, path), frame
+
+
+def prefetch(iterable, maxsize=64):
+    """Run `iterable` on a background thread, yielding through a bounded queue."""
+    q = queue.Queue(maxsize=maxsize)
+    done = object()
+    error = []
+
+    def produce():
+        try:
+            for item in iterable:
+                q.put(item)
+        except Exception as e:
+            error.append(e)
+        finally:
+            q.put(done)
+
+    threading.Thread(target=produce, daemon=True).start()
+    while True:
+        item = q.get()
+        if item is done:
+            break
+        yield item
+    if error:
+        raise error[0]
+
+
+class RecordWriter:
+    """Streams records to .jsonl or .csv."""
+
+    def __init__(self, path, header=True):
+        self.format = 'csv' if path.endswith('.csv') else 'jsonl'
+        self.file = open(path, 'w', newline='')
+        if self.format == 'csv':
+            self.writer = csv.DictWriter(self.file, FIELDS)
+            if header:
+                self.writer.writeheader()
+
+    def write(self, record):
+        if self.format == 'csv':
+            self.writer.writerow(record)
+        else:
+            self.file.write(json.dumps(record) + '\n')
+
+    def close(self):
+        self.file.close()
+
+
+def process_input(detector, source, writer, stride=1, batch_size=32):
+    """Run `detector` over one video file or image folder; returns records written."""
+    count = 0
+    if os.path.isdir(source):
+        batch = []
+
+        def flush():
+            for (index, name, _), (label, conf) in zip(batch, detector.predict_batch([b[2] for b in batch])):
+                writer.write({'source': os.path.join(source, name), 'frame': index, 'time_ms': None,
+                              'label': label and str(label), 'confidence': round(conf, 4)})
+            batch.clear()
+
+        for item in prefetch(iter_images(source, stride)):
+            batch.append(item)
+            count += 1
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+    else:
+        detector.reset()
+        for index, time_ms, frame in prefetch(iter_video(source, stride)):
+            label, conf, _ = detector.predict(frame, annotate=False)
+            writer.write({'source': source, 'frame': index, 'time_ms': round(time_ms, 1),
+                          'label': label and str(label), 'confidence': round(conf, 4)})
+            count += 1
+    return count
+
+
+_worker = None
+
+
+def _init_worker(detector_kwargs, output_format, tmpdir, stride):
+    global _worker
+    from live_sign_detect import Detector
+    cv2.setNumThreads(1)
+    _worker = (Detector(**detector_kwargs), output_format, tmpdir, stride)
+
+
+def _run_worker(job):
+    index, source = job
+    detector, output_format, tmpdir, stride = _worker
+    part = os.path.join(tmpdir, f'{index:06d}.{output_format}')
+    writer = RecordWriter(part, header=False)
+    try:
+        count = process_input(detector, source, writer, stride)
+    finally:
+        writer.close()
+    return part, source, count
+
+
+def run(inputs, output, processes=1, stride=1, detector_kwargs=None):
+    detector_kwargs = detector_kwargs or {}
+    writer = RecordWriter(output)
+    total = 0
+    start = time.time()
+    try:
+        if processes <= 1:
+            from live_sign_detect import Detector
+            detector = Detector(**detector_kwargs)
+            for source in inputs:
+                count = process_input(detector, source, writer, stride)
+                total += count
+                print(f"  {source}: {count} frames", file=sys.stderr)
+        else:
+            tmpdir = tempfile.mkdtemp(prefix='batch_detect_')
+            try:
+                with Pool(processes, initializer=_init_worker,
+                          initargs=(detector_kwargs, writer.format, tmpdir, stride)) as pool:
+                    # imap keeps input order, so parts are appended in order.
+                    for part, source, count in pool.imap(_run_worker, enumerate(inputs)):
+                        writer.file.flush()
+                        with open(part, newline='') as f:
+                            shutil.copyfileobj(f, writer.file)
+                        os.remove(part)
+                        total += count
+                        print(f"  {source}: {count} frames", file=sys.stderr)
+            finally:
+                shutil.rmtree(tmpdir, ignore_errors=True)
+    finally:
+        writer.close()
+    elapsed = time.time() - start
+    print(f"✅ {total} frames in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.1f} fps) -> {output}")
+    return total
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('inputs', nargs='+', help='video files and/or image folders')
+    parser.add_argument('-o', '--output', required=True, help='.jsonl or .csv')
+    parser.add_argument('--processes', type=int, default=1)
+    parser.add_argument('--stride', type=int, default=1, help='process every Nth frame/image')
+    parser.add_argument('--keyframe-interval', type=int, default=1)
+    parser.add_argument('--detect-max-side', type=int, default=None)
+    args = parser.parse_args()
+
+    run(args.inputs, args.output, processes=args.processes, stride=args.stride,
+        detector_kwargs={'keyframe_interval': args.keyframe_interval,
+                         'detect_max_side': args.detect_max_side})
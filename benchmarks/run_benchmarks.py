@@ -0,0 +1,279 @@
+"""Offline CPU microbenchmarks for the inference and feature paths.
+
+    python benchmarks/run_benchmarks.py                    # run and compare to baseline
+    python benchmarks/run_benchmarks.py --save-baseline    # record this box's baseline
+    python benchmarks/run_benchmarks.py -k classify --keras
+
+Inputs are fixed: synthetic frames from a seeded RNG and the stored hand
+landmark fixture in benchmarks/fixtures/landmarks.npy. Each case reports
+ops/s (items per second, so batch cases count vectors) and per-call latency
+percentiles. With a baseline present, any case whose p50 is more than
+`--tolerance` slower than the baseline is flagged and the exit status is 1.
+
+Baselines are machine-specific: record one on the box you deploy to.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ.setdefault('KERAS_BACKEND', 'jax')
+
+import argparse
+import hashlib
+import io
+import json
+import logging
+import shutil
+import tempfile
+import time
+import warnings
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+warnings.filterwarnings('ignore')
+
+FIXTURE_PATH = os.path.join(ROOT, 'benchmarks', 'fixtures', 'landmarks.npy')
+BASELINE_PATH = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+BATCH_SIZES = (1, 4, 16, 64, 256, 1024)
+
+
+def make_landmark_fixture(n=512, seed=20240601):
+    """Hand-like landmarks: a wrist plus five 4-joint fingers, jittered per sample."""
+    rng = np.random.default_rng(seed)
+    base = np.zeros((21, 3), np.float32)
+    for f in range(5):
+        ang = np.deg2rad(-60 + 30 * f)
+        for j in range(4):
+            r = 0.06 + 0.035 * j
+            base[1 + 4 * f + j] = [np.sin(ang) * r, -np.cos(ang) * r, -0.01 * j]
+    pts = base[None] * rng.uniform(0.6, 1.4, (n, 1, 1)) + rng.normal(0, 0.01, (n, 21, 3))
+    pts[..., :2] += rng.uniform(0.3, 0.7, (n, 1, 2))
+    return pts.astype(np.float32)
+
+
+def load_fixture():
+    if not os.path.exists(FIXTURE_PATH):
+        os.makedirs(os.path.dirname(FIXTURE_PATH), exist_ok=True)
+        np.save(FIXTURE_PATH, make_landmark_fixture())
+    return np.load(FIXTURE_PATH)
+
+
+def synthetic_frame(width=1280, height=720, seed=0):
+    rng = np.random.default_rng(seed)
+    small = rng.integers(0, 256, (height // 8, width // 8, 3), dtype=np.uint8)
+    return cv2.resize(small, (width, height), interpolation=cv2.INTER_LINEAR)
+
+
+def as_landmarks(pts):
+    """Wrap a (21, 3) array as objects with x/y/z like MediaPipe landmarks."""
+    return [SimpleNamespace(x=float(x), y=float(y), z=float(z)) for x, y, z in pts]
+
+
+def landmark_list(pts):
+    from mediapipe.framework.formats import landmark_pb2
+    lm = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z in pts:
+        lm.landmark.add(x=x, y=y, z=z)
+    return lm
+
+
+def measure(fn, items=1, min_time=1.0, min_calls=5, warmup=2):
+    """Call `fn` repeatedly; return ops/s and latency percentiles (ms)."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    start = time.perf_counter()
+    while len(samples) < min_calls or time.perf_counter() - start < min_time:
+        t = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t)
+    values = np.array(samples) * 1e3
+    p50, p95, p99 = np.percentile(values, (50, 95, 99))
+    return {'ops_per_s': items * len(values) / (values.sum() / 1e3), 'p50': float(p50),
+            'p95': float(p95), 'p99': float(p99), 'calls': len(values)}
+
+
+# -- cases ---------------------------------------------------------------
+# Each yields (name, fn, items) so setup cost stays out of the timings.
+
+def features_cases(fixture):
+    from landmark_features import FEATURE_DIM, normalize_batch, normalize_landmarks
+
+    single = as_landmarks(fixture[0])
+    buf = np.empty(FEATURE_DIM, dtype=np.float32)
+    yield 'features.normalize_landmarks', lambda: normalize_landmarks(single, out=buf), 1
+    batch = np.resize(fixture, (1024, 21, 3))
+    yield 'features.normalize_batch[1024]', lambda: normalize_batch(batch), len(batch)
+
+
+def classify_cases(fixture, engines):
+    from landmark_features import normalize_batch
+    from live_sign_detect import Detector
+
+    vectors = normalize_batch(np.resize(fixture, (max(BATCH_SIZES), 21, 3)))
+    for engine in engines:
+        detector = Detector(engine=engine)
+        for n in BATCH_SIZES:
+            x = vectors[:n]
+            yield f'classify.{engine}[{n}]', lambda x=x, d=detector: d.classify_landmarks(x), n
+        raw = np.resize(fixture, (8192, 21, 3))
+        yield (f'classify.{engine}.raw_top3[{len(raw)}]',
+               lambda d=detector: d.classify_raw(raw, top_k=3), len(raw))
+
+
+def detector_cases(fixture):
+    from live_sign_detect import Detector
+
+    frame = synthetic_frame()
+    detector = Detector()
+    yield 'detector.predict[720p]', lambda: detector.predict(frame), 1
+
+    # Same call with MediaPipe replaced by fixture landmarks, to time the
+    # normalize/classify/smooth/annotate part of the hot path on its own.
+    injected = Detector()
+    hands = [landmark_list(p) for p in fixture[:64]]
+    counter = iter(range(10 ** 12))
+    injected._detect = lambda f: [(hands[next(counter) % len(hands)], 'Right')]
+    yield 'detector.predict[720p,injected]', lambda: injected.predict(frame), 1
+
+
+def streamlit_cases():
+    # The apps are Streamlit scripts; importing them outside `streamlit run`
+    # executes the page in bare mode, which is harmless but noisy.
+    import streamlit  # noqa: F401
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith('streamlit'):
+            logging.getLogger(name).setLevel(logging.ERROR)
+    from PIL import Image
+    import streamlit_app
+    import streamlit_photo_app
+
+    image = Image.fromarray(cv2.cvtColor(synthetic_frame(), cv2.COLOR_BGR2RGB))
+    encoded = cv2.imencode('.jpg', synthetic_frame())[1].tobytes()
+    digest = hashlib.sha1(encoded).hexdigest()
+    for module in (streamlit_app, streamlit_photo_app):
+        model, le, pool = module.load_model()
+
+        def predict(m=module, model=model, le=le, pool=pool):
+            with pool.checkout() as hands:
+                return m.predict_gesture(image, model, le, hands)
+        yield f'{module.__name__}.predict_gesture[720p]', predict, 1
+        # What a rerun costs once the image is in the result cache.
+        yield (f'{module.__name__}.cached_prediction[720p,hit]',
+               lambda m=module: m.cached_prediction(digest, encoded), 1)
+
+    # A phone photo: full decode vs the reduced decode the apps use.
+    from image_preprocess import load_image
+    photo = cv2.imencode('.jpg', synthetic_frame(4032, 3024))[1].tobytes()
+    yield 'image.full_decode[12MP]', lambda: np.asarray(Image.open(io.BytesIO(photo)).convert('RGB')), 1
+    yield 'image_preprocess.load_image[12MP]', lambda: np.asarray(load_image(photo)), 1
+
+    # Rendering a detection: vector overlay vs annotated copies.
+    import landmark_overlay
+    shown, points = load_image(photo), load_fixture()[0]
+    yield 'landmark_overlay.overlay_html[960]', lambda: landmark_overlay.overlay_html(shown, points), 1
+    yield ('landmark_overlay.draw_landmarks[preview]',
+           lambda: landmark_overlay.draw_landmarks(shown, points, landmark_overlay.PREVIEW_SIDE), 1)
+    yield 'landmark_overlay.draw_landmarks[full]', lambda: landmark_overlay.draw_landmarks(shown, points), 1
+
+
+def extraction_cases(n_images=32):
+    """Per-image extraction throughput, serial and over a process pool.
+
+    Hands graphs (and the pool's processes) are built once before timing,
+    as a real run builds them once per worker; only `extract` is timed.
+    """
+    from multiprocessing import Pool
+    import extract_landmarks
+
+    tmp = tempfile.mkdtemp(prefix='bench_extract_')
+    cv_threads = cv2.getNumThreads()
+    try:
+        paths = []
+        for i in range(n_images):
+            path = os.path.join(tmp, f'{i}.jpg')
+            cv2.imwrite(path, synthetic_frame(640, 480, seed=i))
+            paths.append(path)
+        extract_landmarks._init_worker()
+        yield ('extract.extract[workers=1]',
+               lambda: [extract_landmarks.extract(p) for p in paths], n_images)
+        cpus = os.cpu_count() or 1
+        if cpus > 1:
+            with Pool(cpus, initializer=extract_landmarks._init_worker) as pool:
+                yield (f'extract.extract[workers={cpus}]',
+                       lambda: pool.map(extract_landmarks.extract, paths, chunksize=1), n_images)
+    finally:
+        cv2.setNumThreads(cv_threads)  # _init_worker limits this process to one
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+GROUPS = {
+    'features': lambda args, fx: features_cases(fx),
+    'classify': lambda args, fx: classify_cases(fx, ['numpy'] + (['keras'] if args.keras else [])),
+    'detector': lambda args, fx: detector_cases(fx),
+    'streamlit': lambda args, fx: streamlit_cases(),
+    'extract': lambda args, fx: extraction_cases(),
+}
+
+
+def compare(results, baseline, tolerance):
+    """Return names of cases whose p50 regressed beyond `tolerance`."""
+    regressions = []
+    for name, r in results.items():
+        base = baseline.get(name)
+        if base and r['p50'] > base['p50'] * (1 + tolerance):
+            regressions.append(name)
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-k', dest='filter', default='', help='only run cases whose name contains this')
+    parser.add_argument('--groups', default=','.join(GROUPS), help='comma-separated: ' + ', '.join(GROUPS))
+    parser.add_argument('--keras', action='store_true', help='also benchmark the jitted Keras engine')
+    parser.add_argument('--min-time', type=float, default=1.0, help='seconds per case')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed p50 slowdown vs baseline')
+    parser.add_argument('--json', help='also write results to this file')
+    args = parser.parse_args()
+
+    fixture = load_fixture()
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = {}
+    print(f"{'case':<48}{'ops/s':>12}{'p50':>9}{'p95':>9}{'p99':>9}  (ms)  vs baseline")
+    for group in args.groups.split(','):
+        for name, fn, items in GROUPS[group](args, fixture):
+            if args.filter not in name:
+                continue
+            r = results[name] = measure(fn, items, min_time=args.min_time)
+            base = baseline.get(name)
+            delta = f"{r['p50'] / base['p50'] - 1:+.0%}" if base else ''
+            print(f"{name:<48}{r['ops_per_s']:>12.1f}{r['p50']:>9.3f}{r['p95']:>9.3f}{r['p99']:>9.3f}        {delta}",
+                  flush=True)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Baseline saved to {args.baseline}")
+        sys.exit(0)
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"❌ {len(regressions)} case(s) slower than baseline by more than {args.tolerance:.0%}:")
+        for name in regressions:
+            print(f"   {name}")
+        sys.exit(1)
+    if baseline:
+        print("✅ No regressions against baseline")
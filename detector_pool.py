@@ -0,0 +1,152 @@
+"""A bounded pool of MediaPipe Hands graphs for concurrent callers.
+
+A Hands graph must not run two `process` calls at once, so a server that
+shares one between sessions serializes every user (or, without a lock,
+corrupts the graph). DetectorPool keeps up to `size` graphs, created lazily
+so an idle app holds only one. Each graph costs about 75 MB of RSS after its
+first frame, so the default is one per core but at most MAX_DEFAULT_SIZE;
+pass `size` explicitly to go higher on a big host:
+
+    pool = DetectorPool(lambda: mp.solutions.hands.Hands(static_image_mode=True))
+    with pool.checkout() as hands:
+        result = hands.process(rgb)
+
+When every graph is checked out, `checkout` waits up to `timeout` seconds
+for one to come back and then raises PoolTimeout, so overload turns into a
+quick "busy" answer instead of an ever-growing queue. A graph whose
+`process` raised is closed and replaced rather than handed out again. The
+classifier is read-only and is shared outside the pool.
+
+`close()` closes the idle graphs and marks the pool closed: graphs still
+checked out are closed when they are released, and later checkouts raise
+RuntimeError.
+
+`stats()` reports size, graphs created, in use (now and peak), checkouts,
+how many had to wait, total wait time and timeouts.
+"""
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+MAX_DEFAULT_SIZE = 4  # ~75 MB per Hands graph
+
+
+class PoolTimeout(TimeoutError):
+    """No detector became free within the checkout timeout."""
+
+
+class DetectorPool:
+    """Up to `size` detectors from `factory`, checked out one caller at a time."""
+
+    def __init__(self, factory, size=None, timeout=10.0):
+        self._factory = factory
+        self.size = size or min(os.cpu_count() or 1, MAX_DEFAULT_SIZE)
+        self.timeout = timeout
+        self._idle = []
+        self._waiting = deque()
+        self._created = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.timeouts = 0
+        self.replaced = 0
+
+    def acquire(self, timeout=None):
+        """Check out a detector, creating one if under `size`; raises PoolTimeout."""
+        timeout = self.timeout if timeout is None else timeout
+        with self._cond:
+            if self._closed:
+                raise RuntimeError('detector pool is closed')
+            if self._waiting or not self._available():
+                # First come, first served: a release goes to the longest waiter.
+                ticket = object()
+                self._waiting.append(ticket)
+                self.waits += 1
+                start = time.perf_counter()
+                ready = self._cond.wait_for(
+                    lambda: self._closed or (self._waiting[0] is ticket and self._available()), timeout)
+                self.wait_time += time.perf_counter() - start
+                self._waiting.remove(ticket)
+                self._cond.notify_all()
+                if self._closed:
+                    raise RuntimeError('detector pool is closed')
+                if not ready:
+                    self.timeouts += 1
+                    raise PoolTimeout(f'all {self.size} detectors busy for {timeout:g}s')
+            detector = self._idle.pop() if self._idle else None
+            if detector is None:
+                self._created += 1  # reserve the slot; build outside the lock
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            self.checkouts += 1
+        if detector is None:
+            try:
+                detector = self._factory()
+            except BaseException:
+                self._discard()
+                raise
+        return detector
+
+    def _available(self):
+        return bool(self._idle) or self._created < self.size
+
+    def release(self, detector, broken=False):
+        """Return a detector; `broken` ones, or any after close(), are closed and their slot freed."""
+        with self._cond:
+            if not broken and not self._closed:
+                self.in_use -= 1
+                self._idle.append(detector)
+                self._cond.notify_all()
+                return
+        _close(detector)
+        self._discard(replaced=broken)
+
+    def _discard(self, replaced=False):
+        with self._cond:
+            self.replaced += replaced
+            self._created -= 1
+            self.in_use -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def checkout(self, timeout=None):
+        detector = self.acquire(timeout)
+        try:
+            yield detector
+        except BaseException:
+            self.release(detector, broken=True)
+            raise
+        self.release(detector)
+
+    def stats(self):
+        with self._cond:
+            return {'size': self.size, 'created': self._created, 'idle': len(self._idle),
+                    'in_use': self.in_use, 'peak_in_use': self.peak_in_use, 'checkouts': self.checkouts,
+                    'waits': self.waits, 'wait_ms': self.wait_time * 1e3, 'timeouts': self.timeouts,
+                    'replaced': self.replaced}
+
+    def close(self):
+        """Close the idle detectors now and the checked-out ones as they come back."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+            self._cond.notify_all()
+        for detector in idle:
+            _close(detector)
+
+
+def _close(detector):
+    close = getattr(detector, 'close', None)
+    if close:
+        try:
+            close()
+        except Exception:
+            pass
@@ -0,0 +1,212 @@
+"""Distill the trained classifier into smaller students, optionally pruned.
+
+    python distill_model.py                                  # default candidates
+    python distill_model.py --students 128,64 64 32 --prune 0.5,0.8 --min-accuracy 0.97
+
+Each student is a ReLU MLP with the given hidden sizes, trained on the same
+split as train_model.py (landmark_dataset.held_out_split) against a blend
+of the teacher's temperature-softened probabilities and the true labels:
+
+  target = alpha * softmax(teacher_logits / T) + (1 - alpha) * one_hot
+
+with the student's logits divided by the same T while training. The
+teacher is the exported NumPy model, so Keras is only needed for the
+students. With `--prune`, every student is also magnitude-pruned to each
+listed sparsity (smallest |w| per kernel set to zero) and fine-tuned with
+the pruning mask held fixed.
+
+Every candidate is exported with export_weights to `--out-dir` and scored
+on the held-out split: accuracy, parameter count (non-zero after pruning),
+file size and per-sample latency with the NumPy engine, at batch 1 and
+amortized over a batch of 256. The smallest candidate meeting
+`--min-accuracy` is reported; use it with `--weights` on the runners or
+Detector(weights_path=...).
+
+Pruned kernels are still stored and multiplied densely, so pruning shows
+in the non-zero count (and the size once compressed), not in NumPy
+latency; the latency gain comes from narrower layers.
+"""
+import os
+os.environ['KERAS_BACKEND'] = 'jax'
+
+import argparse
+import time
+
+import numpy as np
+
+from export_weights import export_weights
+from landmark_dataset import held_out_split, load_training_data
+from numpy_engine import ACTIVATIONS, DEFAULT_WEIGHTS_PATH, NumpyClassifier
+
+DEFAULT_STUDENTS = ('128,64', '64,32', '64', '32')
+
+
+def teacher_logits(clf, X, batch_size=8192):
+    """Pre-softmax outputs of a NumpyClassifier for X."""
+    out = []
+    for start in range(0, len(X), batch_size):
+        x = np.asarray(X[start:start + batch_size], dtype=np.float32)
+        for i, ((W, b), name) in enumerate(zip(clf.layers, clf.activations)):
+            x = x @ W + b
+            if i < len(clf.layers) - 1:
+                x = ACTIVATIONS[name](x)
+        out.append(x)
+    return np.concatenate(out)
+
+
+def soft_targets(logits, y, n_classes, temperature, alpha):
+    z = logits / temperature
+    z -= z.max(axis=1, keepdims=True)
+    p = np.exp(z)
+    p /= p.sum(axis=1, keepdims=True)
+    return (alpha * p + (1 - alpha) * np.eye(n_classes, dtype=np.float32)[y]).astype(np.float32)
+
+
+def build_student(input_dim, hidden, n_classes, temperature=None):
+    """ReLU MLP ending in softmax.
+
+    With a `temperature`, the logits are divided by it before the softmax
+    (for training on softened targets); without one the model is a plain
+    Dense stack that export_weights can write.
+    """
+    import keras
+    from keras import layers
+    inp = layers.Input(shape=(input_dim,))
+    x = inp
+    for units in hidden:
+        x = layers.Dense(units, activation='relu')(x)
+    if temperature is None:
+        return keras.Model(inp, layers.Dense(n_classes, activation='softmax')(x))
+    x = layers.Rescaling(1.0 / temperature)(layers.Dense(n_classes)(x))
+    return keras.Model(inp, layers.Activation('softmax')(x))
+
+
+def inference_copy(model, input_dim, hidden, n_classes):
+    """The trained student's weights in a temperature-free model, for export."""
+    student = build_student(input_dim, hidden, n_classes)
+    dense = [layer for layer in model.layers if layer.get_weights()]
+    for src, dst in zip(dense, [layer for layer in student.layers if layer.get_weights()]):
+        dst.set_weights(src.get_weights())
+    return student
+
+
+def prune(model, sparsity):
+    """Zero the smallest-magnitude `sparsity` fraction of every kernel; returns the masks."""
+    masks = []
+    for layer in model.layers:
+        weights = layer.get_weights()
+        if not weights:
+            continue
+        kernel = weights[0]
+        threshold = np.quantile(np.abs(kernel), sparsity)
+        mask = (np.abs(kernel) > threshold).astype(kernel.dtype)
+        layer.set_weights([kernel * mask] + weights[1:])
+        masks.append((layer, mask))
+    return masks
+
+
+def apply_masks(masks):
+    for layer, mask in masks:
+        weights = layer.get_weights()
+        layer.set_weights([weights[0] * mask] + weights[1:])
+
+
+def latency_us(clf, X, repeats=300):
+    """(batch-1 median, per-sample amortized over batch 256) in microseconds."""
+    one = np.ascontiguousarray(X[:1], dtype=np.float32)
+    batch = np.resize(np.asarray(X, dtype=np.float32), (256, X.shape[1]))
+    clf.predict(one)
+    samples = []
+    for _ in range(repeats):
+        t = time.perf_counter()
+        clf.predict(one)
+        samples.append(time.perf_counter() - t)
+    t = time.perf_counter()
+    for _ in range(20):
+        clf.predict(batch)
+    amortized = (time.perf_counter() - t) / 20 / len(batch)
+    return float(np.median(samples)) * 1e6, amortized * 1e6
+
+
+def score(name, path, X_val, labels):
+    clf = NumpyClassifier(path)
+    acc = float((clf.classes[clf.predict(X_val).argmax(axis=1)] == labels).mean())
+    params = sum(W.size + b.size for W, b in clf.layers)
+    nonzero = sum(int(np.count_nonzero(W)) + b.size for W, b in clf.layers)
+    one, amortized = latency_us(clf, X_val)
+    return {'name': name, 'path': path, 'accuracy': acc, 'params': params, 'nonzero': nonzero,
+            'size_kb': os.path.getsize(path) / 1024, 'latency_us': one, 'amortized_us': amortized}
+
+
+def print_table(rows):
+    print(f"\n{'candidate':<22}{'accuracy':>10}{'params':>9}{'nonzero':>9}{'KB':>8}{'batch1 us':>11}{'per-sample us':>15}")
+    for r in rows:
+        print(f"{r['name']:<22}{r['accuracy']:>10.2%}{r['params']:>9}{r['nonzero']:>9}{r['size_kb']:>8.1f}"
+              f"{r['latency_us']:>11.1f}{r['amortized_us']:>15.2f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--teacher', default=DEFAULT_WEIGHTS_PATH, help='exported teacher weights')
+    parser.add_argument('--students', nargs='+', default=list(DEFAULT_STUDENTS),
+                        help='hidden layer sizes per student, e.g. 128,64 64 32')
+    parser.add_argument('--prune', default='', help='comma-separated sparsities, e.g. 0.5,0.8')
+    parser.add_argument('--temperature', type=float, default=4.0)
+    parser.add_argument('--alpha', type=float, default=0.7, help='weight of the teacher in the targets')
+    parser.add_argument('--epochs', type=int, default=60)
+    parser.add_argument('--finetune-epochs', type=int, default=10)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--min-accuracy', type=float, default=None, help='accuracy bar for the recommendation')
+    parser.add_argument('--out-dir', default='candidates')
+    args = parser.parse_args()
+
+    X, y, classes = load_training_data()
+    X_train, X_val, y_train, y_val = held_out_split(X, y)
+    X_train, X_val = np.asarray(X_train, dtype=np.float32), np.asarray(X_val, dtype=np.float32)
+    labels = np.asarray(classes).astype(str)[y_val]
+    teacher = NumpyClassifier(args.teacher)
+    teacher_index = {str(c): i for i, c in enumerate(teacher.classes)}
+    missing = [c for c in classes if str(c) not in teacher_index]
+    if missing:
+        raise SystemExit(f"❌ Teacher does not know labels {missing}; retrain or re-export it")
+    n_classes, input_dim = len(classes), X.shape[1]
+    # Teacher outputs reordered to the dataset's label table.
+    logits = teacher_logits(teacher, X_train)[:, [teacher_index[str(c)] for c in classes]]
+    targets = soft_targets(logits, y_train, n_classes, args.temperature, args.alpha)
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    rows = [score('teacher', args.teacher, X_val, labels)]
+    sparsities = [float(s) for s in args.prune.split(',') if s]
+    for spec in args.students:
+        hidden = [int(u) for u in spec.split(',')]
+        name = 'student_' + 'x'.join(map(str, hidden))
+        print(f"🎓 Training {name}")
+        model = build_student(input_dim, hidden, n_classes, args.temperature)
+        model.compile(optimizer='adam', loss='categorical_crossentropy')
+        model.fit(X_train, targets, epochs=args.epochs, batch_size=args.batch_size, verbose=0)
+        path = export_weights(inference_copy(model, input_dim, hidden, n_classes), classes,
+                              os.path.join(args.out_dir, f'{name}.npz'))
+        rows.append(score(name, path, X_val, labels))
+
+        dense_weights = model.get_weights()
+        for sparsity in sparsities:
+            pruned_name = f'{name}_p{round(sparsity * 100)}'
+            print(f"✂️  Pruning {pruned_name}")
+            model.set_weights(dense_weights)
+            masks = prune(model, sparsity)
+            for _ in range(args.finetune_epochs):
+                # One epoch at a time so the mask is re-applied between epochs.
+                model.fit(X_train, targets, epochs=1, batch_size=args.batch_size, verbose=0)
+                apply_masks(masks)
+            path = export_weights(inference_copy(model, input_dim, hidden, n_classes), classes,
+                                  os.path.join(args.out_dir, f'{pruned_name}.npz'))
+            rows.append(score(pruned_name, path, X_val, labels))
+
+    print_table(rows)
+    if args.min_accuracy is not None:
+        passing = [r for r in rows[1:] if r['accuracy'] >= args.min_accuracy]
+        if passing:
+            best = min(passing, key=lambda r: (r['nonzero'], r['latency_us']))
+            print(f"✅ Smallest candidate with accuracy >= {args.min_accuracy:.2%}: {best['name']} ({best['path']})")
+        else:
+            print(f"❌ No candidate reaches accuracy {args.min_accuracy:.2%}")
@@ -0,0 +1,70 @@
+"""Export the trained Keras model to a NumPy weights file.
+
+    python export_weights.py [--model sign_model.h5] [--labels labels.pkl]
+                             [--out sign_model_weights.npz] [--atol 1e-5]
+
+Dumps every Dense layer (kernel, bias, activation) plus the label table so
+numpy_engine.NumpyClassifier can serve predictions without Keras, then checks
+that both engines agree on random landmark vectors and exits non-zero if they
+differ by more than `--atol`.
+"""
+import os
+os.environ['KERAS_BACKEND'] = 'jax'
+
+import argparse
+import pickle
+import sys
+
+import numpy as np
+
+from numpy_engine import DEFAULT_WEIGHTS_PATH, NumpyClassifier
+
+
+def export_weights(model, classes, weights_path=DEFAULT_WEIGHTS_PATH):
+    """Write the Dense layers of `model` and `classes` to `weights_path`.
+
+    Layers without weights (Input, Dropout) are inference no-ops and skipped.
+    """
+    arrays, activations = {}, []
+    for layer in model.layers:
+        weights = layer.get_weights()
+        if not weights:
+            continue
+        if type(layer).__name__ != 'Dense':
+            raise ValueError(f"Cannot export layer '{layer.name}' ({type(layer).__name__})")
+        i = len(activations)
+        arrays[f'W{i}'], arrays[f'b{i}'] = weights
+        activations.append(layer.activation.__name__)
+    np.savez(weights_path, activations=np.array(activations),
+             classes=np.asarray(classes).astype(str), **arrays)
+    return weights_path
+
+
+def check_parity(model, weights_path=DEFAULT_WEIGHTS_PATH, n=1024, seed=0):
+    """Return the max absolute difference between Keras and NumPy outputs."""
+    rng = np.random.default_rng(seed)
+    x = rng.uniform(-1, 1, size=(n, model.input_shape[-1])).astype(np.float32)
+    expected = model.predict(x, verbose=0)
+    actual = NumpyClassifier(weights_path).predict(x)
+    return float(np.max(np.abs(expected - actual)))
+
+
+if __name__ == '__main__':
+    import keras
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--model', default='sign_model.h5')
+    parser.add_argument('--labels', default='labels.pkl')
+    parser.add_argument('--out', default=DEFAULT_WEIGHTS_PATH)
+    parser.add_argument('--atol', type=float, default=1e-5)
+    args = parser.parse_args()
+
+    model = keras.models.load_model(args.model)
+    with open(args.labels, 'rb') as f:
+        le = pickle.load(f)
+    export_weights(model, le.classes_, args.out)
+    diff = check_parity(model, args.out)
+    if diff > args.atol:
+        print(f"❌ NumPy engine diverges from Keras: max |diff| = {diff:.2e} > {args.atol:.0e}")
+        sys.exit(1)
+    print(f"✅ Weights exported to {args.out} (max |diff| vs Keras = {diff:.2e})")
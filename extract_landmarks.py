@@ -1,28 +1,197 @@
+"""Extract MediaPipe hand landmarks from the gesture image dataset.
+
+    python extract_landmarks.py [--workers N] [--full]
+
+Images are split across a process pool (one MediaPipe Hands instance per
+worker); rows are written in sorted label/file order regardless of the
+worker count, so the CSV is reproducible. `--workers 1` runs in-process.
+
+Results are remembered in a manifest (path, size, mtime, SHA-1 and the
+landmarks or null for "no hand"). Re-runs only send new or changed images
+through MediaPipe and drop entries for deleted ones; `--full` ignores the
+manifest and re-extracts everything.
+
+`--format binary` (or `both`) also writes the memory-mappable dataset from
+landmark_dataset.py, which train_model.py prefers over the CSV unless the CSV
+is newer (a later `--format csv` run).
+"""
 import mediapipe as mp
-import cv2, os, csv, numpy as np
+import cv2, os, csv, sys, time, json, hashlib, argparse, numpy as np
+from multiprocessing import Pool
+
+from landmark_dataset import DATASET_DIR, write_dataset
+
+DATASET_PATH = 'Gesture Image Data'
+OUTPUT_CSV = 'landmarks_dataset.csv'
+MANIFEST_PATH = 'landmarks_manifest.json'
+MANIFEST_VERSION = 1
 
 mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(static_image_mode=True, max_num_hands=1)
 header = ['label'] + [f'{coord}{i}' for i in range(21) for coord in ('x','y','z')]
 
-with open('landmarks_dataset.csv', 'w', newline='') as f:
-    writer = csv.writer(f)
-    writer.writerow(header)
+_hands = None
+
+
+def _init_worker():
+    global _hands
+    cv2.setNumThreads(1)
+    _hands = mp_hands.Hands(static_image_mode=True, max_num_hands=1)
+
 
-    dataset_path = 'Gesture Image Data'
+def extract(path):
+    """Return the 63 landmark coordinates for one image, or None if no hand."""
+    img = cv2.imread(path)
+    if img is None:
+        return None
+    img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+    res = _hands.process(img_rgb)
+    if not res.multi_hand_landmarks:
+        return None
+    lm = res.multi_hand_landmarks[0]
+    return [c for p in lm.landmark for c in (p.x, p.y, p.z)]
+
+
+def list_images(dataset_path=DATASET_PATH):
+    """Return (label, path) pairs in deterministic order."""
+    jobs = []
     for label in sorted(os.listdir(dataset_path)):
         folder = os.path.join(dataset_path, label)
-        for file in os.listdir(folder):
-            path = os.path.join(folder, file)
-            img = cv2.imread(path)
-            img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-            res = hands.process(img_rgb)
-
-            if res.multi_hand_landmarks:
-                lm = res.multi_hand_landmarks[0]
-                data = [label]
-                for p in lm.landmark:
-                    data += [p.x, p.y, p.z]
-                writer.writerow(data)
-
-print("✅ Landmark CSV saved as landmarks_dataset.csv")
+        for file in sorted(os.listdir(folder)):
+            jobs.append((label, os.path.join(folder, file)))
+    return jobs
+
+
+def extract_all(paths, workers=1, chunksize=16):
+    """Yield `extract(path)` for every path, in input order."""
+    if workers <= 1:
+        _init_worker()
+        yield from map(extract, paths)
+        return
+    with Pool(workers, initializer=_init_worker) as pool:
+        yield from pool.imap(extract, paths, chunksize=chunksize)
+
+
+def file_sha1(path, chunk_size=1 << 20):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """Return {image_path: entry} from a previous run, or {} if unusable.
+
+    A manifest written by a different MediaPipe version is discarded, since
+    its landmarks may not match what this version would produce.
+    """
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != MANIFEST_VERSION or data.get('mediapipe') != mp.__version__:
+        return {}
+    return data.get('files', {})
+
+
+def save_manifest(files, path=MANIFEST_PATH):
+    data = {'version': MANIFEST_VERSION, 'mediapipe': mp.__version__, 'files': files}
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def plan_extraction(jobs, previous):
+    """Split `jobs` into reusable manifest entries and images to extract.
+
+    An entry is reused when size and mtime are unchanged. Otherwise the file
+    is hashed, and landmarks are reused from any previous image with the same
+    content (a `touch`, a rename or a copied file).
+
+    Returns (files, pending): `files` maps every current path to its entry
+    (pending ones still lack 'landmarks'); `pending` lists paths to extract.
+    """
+    by_hash = {e['sha1']: e['landmarks'] for e in previous.values()
+               if 'sha1' in e and 'landmarks' in e}
+    files, pending = {}, []
+    for label, path in jobs:
+        st = os.stat(path)
+        old = previous.get(path)
+        if (old and old['label'] == label and 'landmarks' in old
+                and old['size'] == st.st_size and old['mtime_ns'] == st.st_mtime_ns):
+            files[path] = old
+            continue
+        entry = {'label': label, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns,
+                 'sha1': file_sha1(path)}
+        if entry['sha1'] in by_hash:
+            entry['landmarks'] = by_hash[entry['sha1']]
+        else:
+            pending.append(path)
+        files[path] = entry
+    return files, pending
+
+
+class Progress:
+    """Throttled single-line progress report on stderr."""
+
+    def __init__(self, total, interval=1.0):
+        self.total = total
+        self.interval = interval
+        self.start = self.last = time.time()
+
+    def update(self, done, found, force=False):
+        now = time.time()
+        if not force and now - self.last < self.interval:
+            return
+        self.last = now
+        rate = done / max(now - self.start, 1e-9)
+        sys.stderr.write(f"\r  {done}/{self.total} images, {found} hands ({rate:.0f} img/s)")
+        if force:
+            sys.stderr.write("\n")
+        sys.stderr.flush()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--dataset', default=DATASET_PATH)
+    parser.add_argument('--out', default=OUTPUT_CSV)
+    parser.add_argument('--manifest', default=MANIFEST_PATH)
+    parser.add_argument('--full', action='store_true', help='ignore the manifest and re-extract everything')
+    parser.add_argument('--format', choices=('csv', 'binary', 'both'), default='csv')
+    parser.add_argument('--binary-out', default=DATASET_DIR)
+    args = parser.parse_args()
+
+    jobs = list_images(args.dataset)
+    previous = {} if args.full else load_manifest(args.manifest)
+    files, pending = plan_extraction(jobs, previous)
+    removed = len(set(previous) - set(files))
+    print(f"{len(jobs)} images: {len(jobs) - len(pending)} unchanged, "
+          f"{len(pending)} to extract, {removed} removed")
+
+    if pending:
+        progress = Progress(len(pending))
+        found = 0
+        for done, (path, coords) in enumerate(zip(pending, extract_all(pending, args.workers)), 1):
+            files[path]['landmarks'] = coords
+            found += coords is not None
+            progress.update(done, found)
+        progress.update(len(pending), found, force=True)
+    save_manifest(files, args.manifest)
+
+    rows = [(label, files[path]['landmarks']) for label, path in jobs
+            if files[path]['landmarks'] is not None]
+
+    if args.format in ('csv', 'both'):
+        with open(args.out, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for label, coords in rows:
+                writer.writerow([label] + coords)
+        print(f"✅ Landmark CSV saved as {args.out}")
+
+    if args.format in ('binary', 'both'):
+        write_dataset([label for label, _ in rows], [coords for _, coords in rows], args.binary_out)
+        print(f"✅ Binary landmark dataset saved in {args.binary_out}/")
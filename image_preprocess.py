@@ -0,0 +1,49 @@
+"""Decode uploaded/camera photos straight to a detection-sized RGB image.
+
+Phone photos are 12MP or more, but MediaPipe runs its palm detector on a
+~192px input and the landmark model on a ~224px crop, so decoding and
+passing the full resolution only costs time and memory. load_image:
+
+  - asks the JPEG decoder for a reduced-size decode (Image.draft, DCT
+    scaling by 1/2, 1/4 or 1/8), so the full-size bitmap is never built
+  - caps the long side at `max_side` (default MAX_SIDE) with a fast
+    reducing resize
+  - applies the EXIF orientation once, so landmarks and the preview match
+    what the user sees
+  - converts to RGB only when the mode isn't already RGB (RGBA, grayscale,
+    palette, CMYK)
+
+rgb_array returns the pixels as a zero-copy (read-only) NumPy view; copy
+it only when drawing on it. Landmarks are normalized image coordinates,
+so downscaling does not change the features the model sees.
+"""
+from io import BytesIO
+
+import numpy as np
+from PIL import Image, ImageOps
+
+# 4000px phone photos decode at 1/4 scale (1000px) and are then trimmed to this.
+MAX_SIDE = 960
+
+
+def load_image(source, max_side=MAX_SIDE):
+    """Open `source` (bytes, path or file object) as an upright RGB image no larger than `max_side`."""
+    image = Image.open(BytesIO(source) if isinstance(source, (bytes, bytearray, memoryview)) else source)
+    if max_side and max(image.size) > max_side:
+        # Request the capped size in stored orientation; the box below is square,
+        # so the EXIF rotation applied afterwards doesn't change it.
+        scale = max_side / max(image.size)
+        image.draft('RGB', (round(image.width * scale), round(image.height * scale)))
+        image.thumbnail((max_side, max_side), Image.Resampling.BILINEAR)
+    # After the resize, so the transpose works on the small image.
+    ImageOps.exif_transpose(image, in_place=True)
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    return image
+
+
+def rgb_array(image):
+    """(H, W, 3) uint8 view of a PIL image, converting only non-RGB modes."""
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    return np.asarray(image)
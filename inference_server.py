@@ -0,0 +1,323 @@
+"""Asyncio HTTP inference server with micro-batched classification.
+
+    python inference_server.py --port 8000 --workers 4 --max-batch 64 --max-wait-ms 5
+
+Endpoints:
+  POST /predict   body: an encoded image (JPEG/PNG/...)
+                  -> {"label": "A", "confidence": 0.97}  (label null if no hand)
+  POST /classify  raw landmarks from an on-device hand tracker, no image:
+                  JSON {"landmarks": [[[x, y, z] * 21], ...], "top_k": 3}, or
+                  little-endian float32 N*21*3 bytes (Content-Type
+                  application/octet-stream, ?top_k=3)
+                  -> {"labels": [["A", "S", "E"], ...], "confidences": [[...], ...]}
+  GET  /stats     batching and latency counters
+  GET  /health
+
+Hand detection (decode + MediaPipe) runs in a process pool, one static-image
+Hands instance per worker. The resulting feature vectors go through a
+MicroBatcher: requests arriving within `max_wait_ms` of each other, up to
+`max_batch`, are classified together in one Detector.classify_landmarks
+call. /classify requests skip detection; those with fewer than `max_batch`
+hands go through the same MicroBatcher, larger ones are already batches and
+go straight to Detector.classify_raw. Use load_generator.py to drive it
+locally.
+"""
+import os
+os.environ['KERAS_BACKEND'] = 'jax'
+
+import warnings
+warnings.filterwarnings('ignore')
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs
+
+import numpy as np
+
+from landmark_features import normalize_batch
+from latency import LatencyStats
+
+MAX_BODY = 32 * 1024 * 1024
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+# -- hand detection workers (separate processes) -------------------------
+
+_hands = None
+
+
+def _init_worker(min_detection_confidence=0.7):
+    global _hands
+    import cv2
+    import mediapipe as mp
+    cv2.setNumThreads(1)
+    _hands = mp.solutions.hands.Hands(static_image_mode=True, max_num_hands=1,
+                                      min_detection_confidence=min_detection_confidence)
+
+
+def detect_features(image_bytes):
+    """Decode an image and return its normalized 63-float features, or None."""
+    import cv2
+    from landmark_features import normalize_landmarks
+    frame = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
+    if frame is None:
+        raise ValueError('could not decode image')
+    res = _hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    if not res.multi_hand_landmarks:
+        return None
+    return normalize_landmarks(res.multi_hand_landmarks[0].landmark)
+
+
+# -- micro-batching ------------------------------------------------------
+
+class MicroBatcher:
+    """Coalesce concurrent classification requests into batched calls.
+
+    The first waiting request opens a batch; it is dispatched as soon as it
+    holds `max_batch` vectors or `max_wait` seconds have passed. `classify`
+    is a blocking function (N, 63) -> (N, classes), run in a thread so the
+    event loop keeps accepting requests meanwhile.
+    """
+
+    def __init__(self, classify, max_batch=64, max_wait=0.005):
+        self.classify = classify
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.items = 0
+        self.largest = 0
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, vectors):
+        """Classify an (n, 63) array; resolves to an (n, classes) array."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((np.asarray(vectors, dtype=np.float32).reshape(-1, 63), future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            size = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+            while size < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            x = np.concatenate([vectors for vectors, _ in batch])
+            try:
+                probs = await loop.run_in_executor(None, self.classify, x)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.items += len(x)
+            self.largest = max(self.largest, len(x))
+            start = 0
+            for vectors, future in batch:
+                if not future.done():
+                    future.set_result(probs[start:start + len(vectors)])
+                start += len(vectors)
+
+    def stats(self):
+        return {'batches': self.batches, 'items': self.items, 'largest_batch': self.largest,
+                'mean_batch': self.items / self.batches if self.batches else 0.0,
+                'queued': self.queue.qsize(), 'max_batch': self.max_batch,
+                'max_wait_ms': self.max_wait * 1e3}
+
+
+# -- HTTP ----------------------------------------------------------------
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class InferenceServer:
+    """`min_detection_confidence` defaults to the detector's, so /predict
+    agrees with Detector.predict on the same image."""
+
+    def __init__(self, detector, workers=None, max_batch=64, max_wait=0.005, min_detection_confidence=None):
+        self.detector = detector
+        self.classes = detector.classes
+        self.workers = workers or os.cpu_count() or 1
+        if min_detection_confidence is None:
+            min_detection_confidence = detector._min_detection_confidence
+        self.min_detection_confidence = min_detection_confidence
+        # Spawn, not fork: the parent's Detector already runs MediaPipe
+        # threads, and a forked copy of them crashes the workers.
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                        initargs=(self.min_detection_confidence,),
+                                        mp_context=multiprocessing.get_context('spawn'))
+        self.batcher = MicroBatcher(detector.classify_landmarks, max_batch, max_wait)
+        self.latency = LatencyStats()
+        self.routes = {('POST', '/predict'): self.handle_predict,
+                       ('POST', '/classify'): self.handle_classify,
+                       ('GET', '/stats'): self.handle_stats,
+                       ('GET', '/health'): self.handle_health}
+
+    async def handle_predict(self, body, headers, query):
+        if not body:
+            raise HTTPError(400, 'empty body; POST an encoded image')
+        t = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            vec = await loop.run_in_executor(self.pool, detect_features, body)
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        t = self.latency.record_since('detect', t)
+        if vec is None:
+            return {'label': None, 'confidence': 0.0}
+        probs = (await self.batcher.submit(vec))[0]
+        self.latency.record_since('classify', t)
+        idx = int(np.argmax(probs))
+        return {'label': str(self.classes[idx]), 'confidence': float(probs[idx])}
+
+    async def handle_classify(self, body, headers, query):
+        top_k = query.get('top_k', ['1'])[0]
+        try:
+            if headers.get('content-type', '').startswith('application/json'):
+                request = json.loads(body)
+                if 'landmarks' not in request:
+                    raise ValueError('JSON body needs a "landmarks" array')
+                points = np.asarray(request['landmarks'], dtype=np.float32)
+                top_k = request.get('top_k', top_k)
+            else:
+                points = np.frombuffer(body, dtype='<f4')
+            top_k = int(top_k)
+            if points.size % (21 * 3) or top_k < 1:
+                raise ValueError('expected N x 21 x 3 landmarks and top_k >= 1')
+        except (ValueError, TypeError) as e:
+            raise HTTPError(400, str(e))
+        t = time.perf_counter()
+        points = points.reshape(-1, 21, 3)
+        if len(points) < self.batcher.max_batch:
+            # A few hands (e.g. one per frame from an on-device tracker): batch
+            # them with other clients' requests like /predict does.
+            probs = await self.batcher.submit(normalize_batch(points))
+            k = min(top_k, len(self.classes))
+            idx = np.argsort(-probs, axis=1)[:, :k]
+            labels, confs = self.classes[idx], np.take_along_axis(probs, idx, axis=1)
+        else:
+            labels, confs = await asyncio.get_running_loop().run_in_executor(
+                None, self.detector.classify_raw, points, top_k)
+        self.latency.record_since('classify_raw', t)
+        return {'labels': labels.astype(str).tolist(), 'confidences': confs.astype(float).round(6).tolist()}
+
+    async def handle_stats(self, body, headers, query):
+        return {'batching': self.batcher.stats(), 'latency_ms': self.latency.snapshot()}
+
+    async def handle_health(self, body, headers, query):
+        return {'status': 'ok'}
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ', 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ':' in line:
+                        name, value = line.split(':', 1)
+                        headers[name.strip().lower()] = value.strip()
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version == 'HTTP/1.1')
+
+                start = time.perf_counter()
+                try:
+                    length = int(headers.get('content-length', 0))
+                    if length > MAX_BODY:
+                        raise HTTPError(413, 'body too large')
+                    body = await reader.readexactly(length) if length else b''
+                    path, _, query = target.partition('?')
+                    handler = self.routes.get((method, path))
+                    if handler is None:
+                        known = any(p == path for _, p in self.routes)
+                        raise HTTPError(405 if known else 404, f'{method} {path} not supported')
+                    status, payload = 200, await handler(body, headers, parse_qs(query))
+                except HTTPError as e:
+                    status, payload = e.status, {'error': str(e)}
+                except asyncio.IncompleteReadError:
+                    break
+                except Exception as e:
+                    status, payload = 500, {'error': repr(e)}
+                self.latency.record_since('request', start)
+
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8000):
+        self.batcher.start()
+        # Start the workers (and their MediaPipe graphs) before taking traffic.
+        await asyncio.gather(*[asyncio.get_running_loop().run_in_executor(self.pool, time.sleep, 0.01)
+                               for _ in range(self.workers)])
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"✅ Serving on http://{host}:{port} "
+              f"({self.workers} detection workers, max batch {self.batcher.max_batch}, "
+              f"max wait {self.batcher.max_wait * 1e3:.1f} ms)")
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == '__main__':
+    from live_sign_detect import Detector
+    from numpy_engine import DEFAULT_WEIGHTS_PATH
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='hand-detection processes')
+    parser.add_argument('--max-batch', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    parser.add_argument('--engine', default='auto', choices=('auto', 'numpy', 'keras'))
+    parser.add_argument('--weights', default=DEFAULT_WEIGHTS_PATH,
+                        help='NumPy engine weights, e.g. a quantize_model.py output')
+    parser.add_argument('--min-detection-confidence', type=float, default=0.7,
+                        help='MediaPipe hand detection threshold (same default as Detector)')
+    args = parser.parse_args()
+
+    server = InferenceServer(Detector(engine=args.engine, weights_path=args.weights,
+                                      min_detection_confidence=args.min_detection_confidence),
+                             workers=args.workers,
+                             max_batch=args.max_batch, max_wait=args.max_wait_ms / 1e3)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.pool.shutdown(cancel_futures=True)
@@ -0,0 +1,131 @@
+"""Binary landmark dataset, a memory-mappable alternative to the CSV.
+
+A dataset is a directory holding:
+  landmarks.npy    float32 (N, 63) raw landmark coordinates
+  labels.npy       int32 (N,) codes into the label table
+  classes.json     label table, sorted (same order LabelEncoder uses)
+  normalized.npy   normalized features, cached by load_features()
+  normalized.json  fingerprint of the source the cache was built from
+
+Arrays are opened with mmap_mode='r', so loading costs no parse time and
+pages are only read as they are touched.
+
+load_training_data() and held_out_split() are what train_model.py uses, so
+other tools (e.g. quantize_model.py) can evaluate on exactly the same
+validation rows.
+"""
+import json
+import os
+
+import numpy as np
+
+DATASET_DIR = 'landmarks_dataset'
+CSV_PATH = 'landmarks_dataset.csv'
+SPLIT_SEED = 42
+
+
+def _save_atomic(path, array):
+    tmp = path + '.tmp.npy'
+    np.save(tmp, array)
+    os.replace(tmp, path)
+
+
+def write_dataset(labels, coords, path=DATASET_DIR):
+    """Write parallel sequences of labels and 63-float rows to `path`."""
+    os.makedirs(path, exist_ok=True)
+    classes = sorted(set(labels))
+    codes = {label: i for i, label in enumerate(classes)}
+    X = np.asarray(coords, dtype=np.float32).reshape(-1, 63)
+    y = np.fromiter((codes[label] for label in labels), dtype=np.int32, count=len(X))
+    _save_atomic(os.path.join(path, 'landmarks.npy'), X)
+    _save_atomic(os.path.join(path, 'labels.npy'), y)
+    with open(os.path.join(path, 'classes.json'), 'w') as f:
+        json.dump(classes, f)
+    return path
+
+
+def open_dataset(path=DATASET_DIR):
+    """Return (X, y, classes) with X and y memory-mapped read-only."""
+    X = np.load(os.path.join(path, 'landmarks.npy'), mmap_mode='r')
+    y = np.load(os.path.join(path, 'labels.npy'), mmap_mode='r')
+    with open(os.path.join(path, 'classes.json')) as f:
+        classes = json.load(f)
+    return X, y, classes
+
+
+def _fingerprint(path, cache_key):
+    stats = {}
+    for name in ('landmarks.npy', 'labels.npy'):
+        st = os.stat(os.path.join(path, name))
+        stats[name] = [st.st_size, st.st_mtime_ns]
+    return {'cache_key': cache_key, 'source': stats}
+
+
+def load_features(path, normalize, cache_key, chunk_size=65536):
+    """Return (X_normalized, y, classes), building the feature cache if stale.
+
+    `normalize` maps a writable (n, 63) float32 chunk to normalized (n, 63)
+    features. The cache is rebuilt whenever the source arrays change or
+    `cache_key` (which should identify the normalization) differs. It is
+    written chunk by chunk, so peak memory does not grow with dataset size.
+    """
+    X, y, classes = open_dataset(path)
+    cache_path = os.path.join(path, 'normalized.npy')
+    meta_path = os.path.join(path, 'normalized.json')
+    fingerprint = _fingerprint(path, cache_key)
+    try:
+        with open(meta_path) as f:
+            fresh = json.load(f) == fingerprint
+    except (OSError, ValueError):
+        fresh = False
+
+    if not fresh or not os.path.exists(cache_path):
+        tmp = cache_path + '.tmp.npy'
+        out = np.lib.format.open_memmap(tmp, mode='w+', dtype=np.float32, shape=X.shape)
+        for start in range(0, len(X), chunk_size):
+            stop = start + chunk_size
+            out[start:stop] = normalize(np.array(X[start:stop]))
+        out.flush()
+        del out
+        os.replace(tmp, cache_path)
+        with open(meta_path, 'w') as f:
+            json.dump(fingerprint, f)
+
+    return np.load(cache_path, mmap_mode='r'), y, classes
+
+
+def binary_is_stale(path=DATASET_DIR, csv_path=CSV_PATH):
+    """True if the CSV at `csv_path` was written after the binary dataset at `path`."""
+    try:
+        binary_mtime = os.stat(os.path.join(path, 'landmarks.npy')).st_mtime_ns
+    except OSError:
+        return os.path.exists(csv_path)
+    return os.path.exists(csv_path) and os.stat(csv_path).st_mtime_ns > binary_mtime
+
+
+def load_training_data(path=DATASET_DIR, csv_path=CSV_PATH):
+    """Return (X, y, classes): normalized features, int label codes, label table.
+
+    Prefers the binary dataset at `path` (memory-mapped, normalized features
+    cached between runs) and falls back to the CSV, which is also used when
+    it was written after the binary dataset (e.g. a re-extraction with the
+    default `--format csv`), so training never silently uses stale rows.
+    """
+    from landmark_features import FEATURE_VERSION, normalize_batch
+    if os.path.isdir(path):
+        if binary_is_stale(path, csv_path):
+            print(f"⚠️ {csv_path} is newer than {path}/; training on the CSV "
+                  f"(re-run extract_landmarks.py --format both to refresh the binary dataset)")
+        else:
+            return load_features(path, normalize_batch, cache_key=FEATURE_VERSION)
+    import pandas as pd
+    df = pd.read_csv(csv_path)
+    classes, y = np.unique(df['label'].values, return_inverse=True)
+    X = normalize_batch(df.drop(columns=['label']).values)
+    return X, y, list(classes)
+
+
+def held_out_split(X, y, test_size=0.2, seed=SPLIT_SEED):
+    """Stratified (X_train, X_val, y_train, y_val), reproducible via `seed`."""
+    from sklearn.model_selection import train_test_split
+    return train_test_split(X, y, test_size=test_size, stratify=y, random_state=seed)
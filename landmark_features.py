@@ -0,0 +1,75 @@
+"""Landmark features shared by training and every inference entry point.
+
+A feature vector is the 21 MediaPipe hand landmarks translated so the wrist
+is the origin, scaled so the farthest landmark is at distance 1, and
+flattened to 63 float32 values. Keeping the one implementation here is what
+guarantees the model sees the same features at train and serve time.
+
+  normalize_batch(points)            (N, 21, 3) or (N, 63) array -> (N, 63)
+  normalize_landmarks(lms, out=buf)  one MediaPipe landmark list -> (63,)
+"""
+import numpy as np
+
+NUM_LANDMARKS = 21
+FEATURE_DIM = NUM_LANDMARKS * 3
+# Bump when the feature definition changes; used to invalidate cached features.
+FEATURE_VERSION = 'wrist-maxnorm-v1'
+
+
+def normalize_batch(points):
+    """Normalize many hands at once; returns a new (N, 63) float32 array."""
+    pts = np.asarray(points, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3)
+    rel = pts - pts[:, :1, :]
+    scale = np.sqrt(np.einsum('nij,nij->ni', rel, rel)).max(axis=1)
+    scale[scale == 0] = 1
+    rel /= scale[:, None, None]
+    return rel.reshape(-1, FEATURE_DIM)
+
+
+def normalize_points(pts):
+    """Normalize one (21, 3) float32 array in place and return it flattened."""
+    pts -= pts[0]
+    scale = np.sqrt(np.einsum('ij,ij->i', pts, pts).max())
+    if scale > 0:
+        pts /= scale
+    return pts.reshape(FEATURE_DIM)
+
+
+def normalize_landmarks(landmarks, out=None):
+    """Normalize one hand given as MediaPipe landmarks (objects with x, y, z).
+
+    Pass a preallocated float32 `out` of 63 (or 21x3) elements to avoid
+    allocating per frame; the returned (63,) vector is a view of it.
+    """
+    if out is None:
+        out = np.empty(FEATURE_DIM, dtype=np.float32)
+    flat = out.reshape(FEATURE_DIM)
+    flat[:] = [c for p in landmarks for c in (p.x, p.y, p.z)]
+    return normalize_points(flat.reshape(NUM_LANDMARKS, 3))
+
+
+if __name__ == '__main__':
+    # Self-check: the batch and single-sample paths must agree with the
+    # reference definition the model was originally trained on.
+    from types import SimpleNamespace
+
+    rng = np.random.default_rng(0)
+    raw = rng.random((256, NUM_LANDMARKS, 3)).astype(np.float32)
+    raw[0] = raw[0, 0]  # degenerate hand: all points at the wrist
+
+    def reference(s):
+        pts = s.reshape(-1, 3).copy()
+        pts -= pts[0]
+        scale = np.max(np.linalg.norm(pts, axis=1))
+        if scale > 0:
+            pts /= scale
+        return pts.flatten()
+
+    expected = np.array([reference(s) for s in raw])
+    buf = np.empty(FEATURE_DIM, dtype=np.float32)
+    single = np.array([normalize_landmarks([SimpleNamespace(x=x, y=y, z=z) for x, y, z in s], out=buf).copy()
+                       for s in raw])
+    for name, got in (('normalize_batch', normalize_batch(raw)), ('normalize_landmarks', single)):
+        diff = float(np.max(np.abs(got - expected)))
+        assert diff <= 1e-6, f"{name} diverges from reference by {diff:.2e}"
+    print("✅ Landmark features match the reference normalization")
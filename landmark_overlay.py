@@ -0,0 +1,74 @@
+"""Show detected hand landmarks without re-sending an annotated photo.
+
+The Streamlit apps used to copy the photo, draw the landmarks into it and
+send the annotated picture on top of the original. Here the 21 landmark
+coordinates are kept instead and rendered at display time:
+
+  vector   the photo once, with the hand drawn as an inline SVG on top of it
+           (a couple of KB instead of a second image)
+  preview  a small annotated copy (long side PREVIEW_SIDE)
+  full     the annotated photo at full size, as before
+
+  points = landmark_points(hand_landmarks)            # (21, 3), normalized
+  st.markdown(overlay_html(image, points), unsafe_allow_html=True)
+"""
+import base64
+from io import BytesIO
+
+import cv2
+import mediapipe as mp
+import numpy as np
+from mediapipe.framework.formats import landmark_pb2
+from PIL import Image
+
+MODES = ('vector', 'preview', 'full')
+PREVIEW_SIDE = 480
+HAND_CONNECTIONS = sorted(mp.solutions.hands.HAND_CONNECTIONS)
+
+
+def landmark_points(hand_landmarks):
+    """(21, 3) float32 normalized x, y, z of a MediaPipe hand."""
+    return np.array([(p.x, p.y, p.z) for p in hand_landmarks.landmark], dtype=np.float32)
+
+
+def svg_overlay(points, width, height):
+    """SVG of the hand skeleton in pixel coordinates of a width x height image."""
+    xy = points[:, :2] * (width, height)
+    stroke = max(width, height) / 250
+    lines = ''.join(f'<line x1="{xy[a, 0]:.1f}" y1="{xy[a, 1]:.1f}" x2="{xy[b, 0]:.1f}" y2="{xy[b, 1]:.1f}"/>'
+                    for a, b in HAND_CONNECTIONS)
+    dots = ''.join(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{stroke * 1.5:.1f}"/>' for x, y in xy)
+    return (f'<svg viewBox="0 0 {width} {height}" xmlns="http://www.w3.org/2000/svg" '
+            f'style="position:absolute;left:0;top:0;width:100%;height:100%">'
+            f'<g stroke="#FFFFFF" stroke-width="{stroke:.1f}" stroke-linecap="round">{lines}</g>'
+            f'<g fill="#FF3030" stroke="#FFFFFF" stroke-width="{stroke / 2:.1f}">{dots}</g></svg>')
+
+
+def overlay_html(image, points, width=None, caption=None, quality=85):
+    """HTML for `image` (sent once, as JPEG) with the landmarks drawn over it."""
+    buf = BytesIO()
+    image.save(buf, format='JPEG', quality=quality)
+    src = 'data:image/jpeg;base64,' + base64.b64encode(buf.getvalue()).decode()
+    size = f'width:{width}px;max-width:100%' if width else 'width:100%'
+    caption = (f"<figcaption style='text-align:center;color:#888;font-size:14px'>{caption}</figcaption>"
+               if caption else '')
+    return (f"<figure style='margin:0 0 1rem 0'><div style='position:relative;{size}'>"
+            f"<img src='{src}' style='display:block;width:100%'>"
+            f"{svg_overlay(points, *image.size)}</div>{caption}</figure>")
+
+
+def draw_landmarks(image, points, max_side=None):
+    """Annotated copy of `image` (PIL), downscaled to `max_side` first if given."""
+    annotated = np.array(image.convert('RGB'))
+    h, w = annotated.shape[:2]
+    if max_side and max(h, w) > max_side:
+        scale = max_side / max(h, w)
+        annotated = cv2.resize(annotated, (round(w * scale), round(h * scale)), interpolation=cv2.INTER_AREA)
+    hand = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z in points:
+        hand.landmark.add(x=float(x), y=float(y), z=float(z))
+    styles = mp.solutions.drawing_styles
+    mp.solutions.drawing_utils.draw_landmarks(
+        annotated, hand, mp.solutions.hands.HAND_CONNECTIONS,
+        styles.get_default_hand_landmarks_style(), styles.get_default_hand_connections_style())
+    return Image.fromarray(annotated)
@@ -0,0 +1,65 @@
+"""Low-overhead per-stage latency tracking.
+
+Hot paths record raw durations with `time.perf_counter()` pairs; the cost
+is one deque append per stage. Percentiles are only computed when stats
+are queried:
+
+  latency = LatencyStats()
+  t0 = time.perf_counter()
+  ...
+  latency.record('hands', time.perf_counter() - t0)
+  print(latency.format())        # p50/p95/p99 per stage, in ms
+  latency.dump('latency.json')
+"""
+import json
+import time
+from collections import deque
+
+import numpy as np
+
+
+class LatencyStats:
+    """Rolling window of the last `window` samples per stage."""
+
+    def __init__(self, window=1000):
+        self.window = window
+        self._samples = {}
+
+    def record(self, stage, seconds):
+        samples = self._samples.get(stage)
+        if samples is None:
+            samples = self._samples[stage] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def record_since(self, stage, start):
+        """Record the time elapsed since perf_counter() value `start`; returns now."""
+        now = time.perf_counter()
+        self.record(stage, now - start)
+        return now
+
+    def reset(self):
+        self._samples.clear()
+
+    def snapshot(self):
+        """Return {stage: {count, mean, p50, p95, p99, max}} with times in ms."""
+        out = {}
+        for stage, samples in list(self._samples.items()):
+            values = np.array(samples, dtype=np.float64) * 1e3
+            if not len(values):
+                continue
+            p50, p95, p99 = np.percentile(values, (50, 95, 99))
+            out[stage] = {'count': len(values), 'mean': float(values.mean()), 'p50': float(p50),
+                          'p95': float(p95), 'p99': float(p99), 'max': float(values.max())}
+        return out
+
+    def format(self):
+        rows = [f"{'stage':<16}{'n':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)"]
+        for stage, s in sorted(self.snapshot().items()):
+            rows.append(f"{stage:<16}{s['count']:>7}{s['p50']:>9.2f}{s['p95']:>9.2f}"
+                        f"{s['p99']:>9.2f}{s['max']:>9.2f}")
+        return '\n'.join(rows)
+
+    def dump(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        return path
@@ -5,7 +5,10 @@ warnings.filterwarnings('ignore')
 import cv2
 import numpy as np
 from live_sign_detect import Detector
+from speech import FrameTimer, SpeechWorker
 import time
+import argparse
+import threading
 
 try:
     import pyttsx3
@@ -13,17 +16,59 @@ try:
 except:
     VOICE_AVAILABLE = False
 
-class LiveSignDetector:
+class LatestValue:
+    """Single-slot mailbox between threads.
+
+    `put` overwrites whatever is there, so a slow reader never sees a backlog
+    of stale values, only the newest one. Every put bumps a sequence number
+    that readers use to wait for something newer than what they last saw.
+    """
+
     def __init__(self):
-        self.detector = Detector()
-        self.engine = None
+        self._cond = threading.Condition()
+        self._value = None
+        self._seq = 0
+        self._closed = False
+
+    def put(self, value):
+        with self._cond:
+            self._value = value
+            self._seq += 1
+            self._cond.notify_all()
+
+    def get(self, after=0, timeout=None):
+        """Wait for a value newer than sequence `after`; returns (seq, value).
+
+        Returns (after, None) on timeout or once the slot is closed.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._seq > after or self._closed, timeout):
+                return after, None
+            if self._seq <= after:
+                return after, None
+            return self._seq, self._value
+
+    def peek(self):
+        with self._cond:
+            return self._seq, self._value
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class LiveSignDetector:
+    def __init__(self, detector=None, latency_file=None):
+        self.detector = detector or Detector()
+        self.latency = self.detector.latency
+        self.latency_file = latency_file
+        self.speech = None
         if VOICE_AVAILABLE:
-            try:
-                self.engine = pyttsx3.init()
-                self.engine.setProperty('rate', 150)
-                self.engine.setProperty('volume', 0.9)
-            except:
-                self.engine = None
+            self.speech = SpeechWorker(rate=150, volume=0.9, latency=self.latency)
+            if not self.speech.available:
+                self.speech = None
+        self.frame_timer = FrameTimer()
         self.last_spoken = None
         self.last_speak_time = 0
         self.speak_cooldown = 2.0
@@ -39,18 +84,19 @@ class LiveSignDetector:
         self.color_text = (50, 50, 50)
         self.color_overlay = (0, 0, 0)
         
-    def speak(self, text):
-        if not self.voice_enabled or not self.engine:
+    def speak(self, text, stamp=None):
+        """Queue `text` on the speech worker; never blocks the frame loop.
+
+        `stamp` is the perf_counter() capture time of the frame the label came
+        from, used for capture-to-speech latency.
+        """
+        if not self.voice_enabled or not self.speech:
             return
         current_time = time.time()
         if text != self.last_spoken or (current_time - self.last_speak_time) > self.speak_cooldown:
-            try:
-                self.engine.say(text)
-                self.engine.runAndWait()
+            if self.speech.say(text, stamp):
                 self.last_spoken = text
                 self.last_speak_time = current_time
-            except:
-                pass
     
     def draw_ui(self, frame, label, confidence):
         h, w = frame.shape[:2]
@@ -87,7 +133,7 @@ class LiveSignDetector:
         cv2.putText(frame, f"Detections: {self.detection_count}", (panel_x + 10, y_offset + line_h), cv2.FONT_HERSHEY_SIMPLEX, 0.6, self.color_text, 1)
         cv2.putText(frame, f"Subtitles: {'ON' if self.show_subtitles else 'OFF'}", (panel_x + 10, y_offset + 2*line_h), cv2.FONT_HERSHEY_SIMPLEX, 0.6, self.color_text, 1)
         cv2.putText(frame, f"Voice: {'ON' if self.voice_enabled else 'OFF'}", (panel_x + 10, y_offset + 3*line_h), cv2.FONT_HERSHEY_SIMPLEX, 0.6, self.color_text, 1)
-        controls = ["CONTROLS:", "Q - Quit", "S - Subtitles", "V - Voice"]
+        controls = ["CONTROLS:", "Q - Quit", "S - Subtitles", "V - Voice", "L - Latency"]
         ctrl_x = w - 180
         ctrl_y = h - 150
         for i, text in enumerate(controls):
@@ -97,6 +143,7 @@ class LiveSignDetector:
         return frame
     
     def update_fps(self):
+        self.frame_timer.tick(self.speech is not None and self.speech.speaking)
         self.fps_counter += 1
         if self.fps_counter >= 10:
             current_time = time.time()
@@ -105,7 +152,52 @@ class LiveSignDetector:
             self.fps_counter = 0
             self.fps_time = current_time
     
-    def run(self):
+    def report(self):
+        """Print frame-time jitter (silent vs. speaking) and speech counters."""
+        for state, (mean, std, worst, n) in self.frame_timer.summary().items():
+            print(f"Frame time while {state}: mean {mean:.1f} ms, jitter {std:.1f} ms, max {worst:.1f} ms ({n} frames)")
+        if self.speech:
+            print(f"Speech: {self.speech.stats()}")
+        print(f"Detector: {self.detector.stats}")
+        print(self.latency.format())
+
+    def show_latency(self):
+        """Print the latency table now, and save it if a latency file is set."""
+        print(self.latency.format())
+        if self.latency_file:
+            self.latency.dump(self.latency_file)
+
+    def handle_key(self, key):
+        """Apply a keyboard command; returns False when the app should quit."""
+        if key == ord('q') or key == ord('Q'):
+            return False
+        elif key == ord('s') or key == ord('S'):
+            self.show_subtitles = not self.show_subtitles
+        elif key == ord('v') or key == ord('V'):
+            self.voice_enabled = not self.voice_enabled
+        elif key == ord('l') or key == ord('L'):
+            self.show_latency()
+        return True
+
+    def render(self, frame, label, confidence, stamp, label_stamp=None):
+        """Draw the UI, speak, show the frame and handle keys; False to quit.
+
+        `stamp` is the frame's perf_counter() capture time and `label_stamp`
+        that of the frame the label was computed from, if different.
+        """
+        t = time.perf_counter()
+        frame_ui = self.draw_ui(frame, label, confidence)
+        t = self.latency.record_since('draw_ui', t)
+        if label and confidence > 0.7:
+            self.speak(label, stamp if label_stamp is None else label_stamp)
+        self.update_fps()
+        cv2.imshow('Sign Language Detection', frame_ui)
+        keep_running = self.handle_key(cv2.waitKey(1) & 0xFF)
+        now = self.latency.record_since('display', t)
+        self.latency.record('glass_to_glass', now - stamp)
+        return keep_running
+
+    def run(self, pipelined=False):
         cap = cv2.VideoCapture(0)
         if not cap.isOpened():
             return
@@ -114,30 +206,109 @@ class LiveSignDetector:
         cap.set(cv2.CAP_PROP_FPS, 30)
         cv2.namedWindow('Sign Language Detection', cv2.WINDOW_NORMAL)
         try:
+            if pipelined:
+                self._run_pipelined(cap)
+                return
             while True:
+                t = time.perf_counter()
                 ret, frame = cap.read()
                 if not ret:
                     break
+                stamp = self.latency.record_since('capture', t)
                 frame = cv2.flip(frame, 1)
                 label, confidence, annotated = self.detector.predict(frame)
-                frame_ui = self.draw_ui(annotated, label, confidence)
-                if label and confidence > 0.7:
-                    self.speak(label)
-                self.update_fps()
-                cv2.imshow('Sign Language Detection', frame_ui)
-                key = cv2.waitKey(1) & 0xFF
-                if key == ord('q') or key == ord('Q'):
+                if not self.render(annotated, label, confidence, stamp):
                     break
-                elif key == ord('s') or key == ord('S'):
-                    self.show_subtitles = not self.show_subtitles
-                elif key == ord('v') or key == ord('V'):
-                    self.voice_enabled = not self.voice_enabled
         except KeyboardInterrupt:
             pass
         finally:
             cap.release()
             cv2.destroyAllWindows()
+            if self.speech:
+                self.speech.close()
+            self.report()
+
+    def _run_pipelined(self, cap):
+        """Capture, inference and rendering on separate threads.
+
+        The capture thread publishes only the newest frame and the inference
+        thread always works on the newest frame it has not seen, so no queue
+        of stale frames can build up. The UI thread renders every captured
+        frame with the most recent result (landmarks included), so display
+        runs at the camera's rate even when inference is slower.
+        """
+        frames = LatestValue()
+        results = LatestValue()
+        stop = threading.Event()
+
+        def capture():
+            while not stop.is_set():
+                t = time.perf_counter()
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                stamp = self.latency.record_since('capture', t)
+                frames.put((stamp, cv2.flip(frame, 1)))
+            stop.set()
+            frames.close()
+
+        def infer():
+            seq = 0
+            while not stop.is_set():
+                seq, item = frames.get(after=seq, timeout=0.1)
+                if item is None:
+                    continue
+                stamp, frame = item
+                label, confidence, _ = self.detector.predict(frame, annotate=False)
+                results.put((label, confidence, [h[3] for h in self.detector.last_hands], stamp))
+
+        workers = [threading.Thread(target=capture, daemon=True),
+                   threading.Thread(target=infer, daemon=True)]
+        for t in workers:
+            t.start()
+        try:
+            seq = 0
+            while not stop.is_set():
+                seq, item = frames.get(after=seq, timeout=0.1)
+                if item is None:
+                    continue
+                stamp, frame = item
+                # The inference thread may still be reading this frame.
+                frame = frame.copy()
+                _, result = results.peek()
+                label, confidence, landmarks, result_stamp = result or (None, 0.0, [], stamp)
+                self.latency.record_since('result_age', result_stamp)
+                for lm in landmarks:
+                    self.detector.mp_draw.draw_landmarks(frame, lm, self.detector.mp_hands.HAND_CONNECTIONS)
+                if not self.render(frame, label, confidence, stamp, result_stamp):
+                    break
+        finally:
+            stop.set()
+            frames.close()
+            for t in workers:
+                t.join(timeout=1.0)
 
 if __name__ == '__main__':
-    app = LiveSignDetector()
-    app.run()
+    parser = argparse.ArgumentParser(description='Live sign language detection')
+    parser.add_argument('--pipelined', action='store_true',
+                        help='run capture, inference and rendering on separate threads')
+    parser.add_argument('--keyframe-interval', type=int, default=1,
+                        help='run full hand detection every N frames and track landmarks in between')
+    parser.add_argument('--detect-max-side', type=int, default=None,
+                        help='downscale frames so hand detection sees at most this many pixels on the long side')
+    parser.add_argument('--roi-padding', type=float, default=None,
+                        help='detect on a crop around the previous hand, padded by this fraction of its size')
+    parser.add_argument('--memo-threshold', type=float, default=None,
+                        help='reuse the last classification while landmarks move less than this (normalized units)')
+    parser.add_argument('--two-hands', action='store_true',
+                        help='detect and classify both hands (labels shown left to right)')
+    parser.add_argument('--latency-file', default=None,
+                        help='write per-stage latency percentiles (JSON) here when L is pressed')
+    args = parser.parse_args()
+    app = LiveSignDetector(Detector(keyframe_interval=args.keyframe_interval,
+                                    detect_max_side=args.detect_max_side,
+                                    roi_padding=args.roi_padding,
+                                    memo_threshold=args.memo_threshold,
+                                    max_hands=2 if args.two_hands else 1),
+                           latency_file=args.latency_file)
+    app.run(pipelined=args.pipelined)
@@ -8,12 +8,16 @@ warnings.filterwarnings('ignore')
 
 import cv2
 import mediapipe as mp
+from mediapipe.framework.formats import landmark_pb2
 import numpy as np
-import keras
 import pickle
 import time
 from collections import deque, Counter
 
+from landmark_features import FEATURE_DIM, NUM_LANDMARKS, normalize_batch, normalize_landmarks
+from latency import LatencyStats
+from numpy_engine import DEFAULT_WEIGHTS_PATH, NumpyClassifier, check_labels
+
 
 class Detector:
     """Hand sign detector wrapper.
@@ -22,78 +26,497 @@ class Detector:
       detector = Detector(model_path='sign_model.h5', labels_path='labels.pkl')
       label, conf, annotated = detector.predict(frame_bgr)
 
+      # many frames / landmark vectors in one classifier call
+      results = detector.predict_batch([frame_a, frame_b])
+      probs = detector.classify_landmarks(vectors)   # (N, 63) -> (N, classes)
+      labels, confs = detector.classify_raw(points, top_k=3)   # raw (N, 21, 3)
+
+    `engine` selects the classifier backend: 'numpy' runs the exported
+    weights file (see export_weights.py) without importing Keras or JAX,
+    'keras' loads `model_path` and jit-compiles it on JAX, and 'auto' (the
+    default) picks 'numpy' whenever the weights file exists. The NumPy
+    engine takes its labels from the weights file and checks them against
+    `labels_path` (when that file exists; pass None for weights trained on a
+    different label set, e.g. a distill_model.py candidate).
+
+    With `keyframe_interval=N` (N > 1) full MediaPipe detection only runs on
+    every Nth frame; in between, the 21 landmarks from the last detection are
+    carried forward with pyramidal Lucas-Kanade optical flow. Detection runs
+    early whenever fewer than `min_track_ratio` of the points could be
+    tracked. Counters are kept in `stats`.
+
+    `detect_max_side` downscales what MediaPipe sees so its long side is at
+    most that many pixels, and `roi_padding` (a fraction of the hand's size)
+    makes detection run on a padded crop around the previous hand instead
+    of the whole frame, falling back to the full frame when the hand is lost.
+    Crops go to a separate static-image Hands, so the video tracker only ever
+    sees whole frames. Landmarks are always mapped back to full-frame
+    coordinates.
+
+    With `memo_threshold` set, `predict` reuses the previous classification
+    while the normalized landmark vector stays within that Euclidean
+    distance of the one last sent to the classifier (a held sign). The
+    reused label still goes through the smoothing `buffer`, so the output is
+    unchanged; hits and misses are counted in `stats`.
+
+    Per-stage timings (convert, hands, track, normalize, classify, annotate
+    and the whole predict) are recorded in `latency`, a LatencyStats that
+    can be passed in to share it with the caller's own stages.
+
+    `max_hands=2` tracks both hands: they are classified together in one
+    batched model call and smoothed separately (see `predict`). Landmark
+    tracking, ROI crops and the memo are single-hand only.
+
+    Passing another Detector as `classifier` reuses its loaded model (and
+    engine) instead of loading one, so several trackers can share a model.
+
     The class is safe to import (it won't open the webcam). The module also
     contains a small CLI when run directly that starts the webcam and uses
     pyttsx3 to speak predictions.
     """
 
     def __init__(self, model_path='sign_model.h5', labels_path='labels.pkl',
-                 buffer_len=5, min_detection_confidence=0.7, min_tracking_confidence=0.7):
-        self.model = keras.models.load_model(model_path)
-        with open(labels_path, 'rb') as f:
-            self.le = pickle.load(f)
+                 buffer_len=5, min_detection_confidence=0.7, min_tracking_confidence=0.7,
+                 weights_path=DEFAULT_WEIGHTS_PATH, engine='auto',
+                 keyframe_interval=1, min_track_ratio=0.9,
+                 detect_max_side=None, roi_padding=None, memo_threshold=None,
+                 latency=None, classifier=None, max_hands=1):
+        if engine == 'auto':
+            engine = 'numpy' if os.path.exists(weights_path) else 'keras'
+        if classifier is not None:
+            # Share another Detector's loaded model instead of loading a copy.
+            self.model, self._forward = classifier.model, classifier._forward
+            self.classes, engine = classifier.classes, classifier.engine
+        elif engine == 'numpy':
+            self.model = NumpyClassifier(weights_path)
+            self._forward = self.model.predict
+            self.classes = self.model.classes
+            # The label table comes from the weights file; make sure it is not stale.
+            check_labels(self.classes, labels_path, weights_path)
+        elif engine == 'keras':
+            import keras
+            self.model = keras.models.load_model(model_path)
+            self._forward = self._compile_forward(self.model)
+            with open(labels_path, 'rb') as f:
+                self.classes = pickle.load(f).classes_
+        else:
+            raise ValueError(f"Unknown engine '{engine}' (expected 'auto', 'numpy' or 'keras')")
+        self.engine = engine
+        if max_hands > 1 and (keyframe_interval > 1 or roi_padding is not None or memo_threshold is not None):
+            raise ValueError("keyframe_interval, roi_padding and memo_threshold only support max_hands=1")
+        self.max_hands = max_hands
 
         self.mp_hands = mp.solutions.hands
         self.hands = self.mp_hands.Hands(
             static_image_mode=False,
-            max_num_hands=1, 
+            max_num_hands=max_hands,
             min_detection_confidence=min_detection_confidence,
             min_tracking_confidence=min_tracking_confidence
         )
         self.mp_draw = mp.solutions.drawing_utils
         self.buffer = deque(maxlen=buffer_len)
+        self.hand_buffers = {}  # handedness -> deque, when max_hands > 1
+        self._min_detection_confidence = min_detection_confidence
+        self._static_hands = None
+        self._vecs = np.empty((max_hands, FEATURE_DIM), dtype=np.float32)
+        self.last_landmarks = None
+        self.last_hands = []
+        self._handedness = None  # of the hand being tracked
+
+        self.keyframe_interval = keyframe_interval
+        self.min_track_ratio = min_track_ratio
+        self._track = None  # (points (21, 1, 2) in pixels, z (21,)) from the last hand
+        self._prev_gray = None
+        self._since_keyframe = 0
+
+        self.detect_max_side = detect_max_side
+        self.roi_padding = roi_padding
+        self._roi = None  # (x0, y0, x1, y1) crop around the last detected hand
+        self._frame_shape = None  # (H, W) that _track, _prev_gray and _roi refer to
+
+        self.memo_threshold = memo_threshold
+        self._memo_vec = np.empty(FEATURE_DIM, dtype=np.float32)
+        self._memo = None  # (label, confidence) classified from _memo_vec
+
+        self.latency = latency if latency is not None else LatencyStats()
+        self.stats = {'frames': 0, 'keyframes': 0, 'tracked': 0, 'track_lost': 0,
+                      'roi_hits': 0, 'roi_misses': 0, 'memo_hits': 0, 'memo_misses': 0,
+                      'keyframe_interval': keyframe_interval}
+
+    def reset(self):
+        """Forget the current stream before starting an unrelated one.
+
+        Clears the smoothing buffers and the tracking, ROI and memo state,
+        and resets the MediaPipe video tracker, so nothing from one video
+        (its hand position or frame size) carries into the next. Counters in
+        `stats` and `latency` keep accumulating.
+        """
+        self.hands.reset()
+        self.buffer.clear()
+        self.hand_buffers.clear()
+        self._track, self._prev_gray, self._roi, self._frame_shape = None, None, None, None
+        self._since_keyframe = 0
+        self._memo = None
+        self._handedness = None
+        self.last_landmarks = None
+        self.last_hands = []
 
     @staticmethod
-    def _normalize(lms):
-        pts = np.array([[p.x, p.y, p.z] for p in lms], dtype=np.float32)
-        wrist = pts[0]
-        pts -= wrist
-        scale = np.max(np.linalg.norm(pts, axis=1))
-        if scale > 0:
-            pts /= scale
-        return pts.flatten()
-
-    def predict(self, frame_bgr):
+    def _normalize(lms, out=None):
+        return normalize_landmarks(lms, out=out)
+
+    @staticmethod
+    def _compile_forward(model):
+        """Build a jitted inference forward pass for `model`.
+
+        Keras' `predict` sets up a data pipeline on every call, which costs far
+        more than the MLP itself; calling the stateless model through
+        `jax.jit` compiles once per input shape and then runs straight through.
+        Batches are padded to the next power of two so only a handful of
+        shapes ever compile.
+        """
+        import jax
+
+        # Own copies of the weights: Keras may donate its variable buffers.
+        trainable = [jax.numpy.array(v.numpy()) for v in model.trainable_variables]
+        non_trainable = [jax.numpy.array(v.numpy()) for v in model.non_trainable_variables]
+
+        @jax.jit
+        def forward(trainable, non_trainable, x):
+            out, _ = model.stateless_call(trainable, non_trainable, x, training=False)
+            return out
+
+        def run(x):
+            n = len(x)
+            size = 1 << (n - 1).bit_length()
+            if size != n:
+                x = np.concatenate([x, np.zeros((size - n, x.shape[1]), dtype=np.float32)])
+            return np.asarray(forward(trainable, non_trainable, x))[:n]
+
+        return run
+
+    def classify_landmarks(self, vectors):
+        """Classify normalized landmark vectors in a single call.
+
+        `vectors` is anything reshapeable to (N, 63). Returns an (N, classes)
+        float32 array of probabilities.
+        """
+        x = np.asarray(vectors, dtype=np.float32).reshape(-1, 63)
+        if len(x) == 0:
+            return np.zeros((0, len(self.classes)), dtype=np.float32)
+        return self._forward(x)
+
+    def classify_raw(self, points, top_k=1, chunk_size=8192):
+        """Classify raw hand landmarks in bulk, without images or MediaPipe.
+
+        `points` is anything reshapeable to (N, 21, 3): landmarks as produced
+        by any hand tracker (x, y in image-normalized units, z relative
+        depth). They are normalized exactly like `predict` does, then
+        classified `chunk_size` at a time.
+
+        Returns (labels, confidences), each shaped (N, top_k) and ordered
+        from most to least likely.
+        """
+        pts = np.asarray(points, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3)
+        k = max(1, min(top_k, len(self.classes)))
+        idx = np.empty((len(pts), k), dtype=np.intp)
+        confs = np.empty((len(pts), k), dtype=np.float32)
+        for start in range(0, len(pts), chunk_size):
+            probs = self.classify_landmarks(normalize_batch(pts[start:start + chunk_size]))
+            top = np.argsort(-probs, axis=1)[:, :k]
+            idx[start:start + len(top)] = top
+            confs[start:start + len(top)] = np.take_along_axis(probs, top, axis=1)
+        return self.classes[idx], confs
+
+    def predict_batch(self, frames):
+        """Classify many BGR frames with one classifier call.
+
+        Hand detection still runs per frame, but all detected hands are
+        classified together. Frames are treated as independent (e.g. from
+        different sources): they go through a separate static-image Hands
+        instance so the video tracker is not disturbed, the smoothing buffer
+        is not touched and no annotation is drawn.
+
+        Returns a list of (label_or_None, confidence_float), one per frame.
+        """
+        static_hands = self._get_static_hands()
+        results = [(None, 0.0)] * len(frames)
+        found = []
+        vecs = np.empty((len(frames), FEATURE_DIM), dtype=np.float32)
+        for i, frame_bgr in enumerate(frames):
+            rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+            res = static_hands.process(rgb)
+            if res.multi_hand_landmarks:
+                self._normalize(res.multi_hand_landmarks[0].landmark, out=vecs[len(found)])
+                found.append(i)
+        if not found:
+            return results
+
+        probs = self.classify_landmarks(vecs[:len(found)])
+        idx = np.argmax(probs, axis=1)
+        labels = self.classes[idx]
+        confs = probs[np.arange(len(idx)), idx]
+        for i, label, conf in zip(found, labels, confs):
+            results[i] = (label, float(conf))
+        return results
+
+    def _get_static_hands(self):
+        """Static-image Hands for inputs the video tracker must not see."""
+        if self._static_hands is None:
+            self._static_hands = self.mp_hands.Hands(
+                static_image_mode=True,
+                max_num_hands=1,
+                min_detection_confidence=self._min_detection_confidence
+            )
+        return self._static_hands
+
+    def _process_region(self, frame_bgr, region, hands=None):
+        """Run MediaPipe (`hands`, default the video tracker) on `region` of the frame.
+
+        Returns a list of (landmarks, handedness) with landmarks in full-frame
+        coordinates and handedness 'Left' or 'Right'; empty if no hand.
+        """
+        t = time.perf_counter()
+        H, W = frame_bgr.shape[:2]
+        x0, y0, x1, y1 = region
+        crop = frame_bgr[y0:y1, x0:x1]
+        cw, ch = x1 - x0, y1 - y0
+        if self.detect_max_side and max(cw, ch) > self.detect_max_side:
+            scale = self.detect_max_side / max(cw, ch)
+            crop = cv2.resize(crop, (max(1, round(cw * scale)), max(1, round(ch * scale))),
+                              interpolation=cv2.INTER_AREA)
+        rgb = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+        t = self.latency.record_since('convert', t)
+        res = (hands or self.hands).process(rgb)
+        self.latency.record_since('hands', t)
+        if not res.multi_hand_landmarks:
+            return []
+        hands = []
+        for lm, handed in zip(res.multi_hand_landmarks, res.multi_handedness):
+            if (cw, ch) != (W, H):
+                for p in lm.landmark:
+                    p.x = (p.x * cw + x0) / W
+                    p.y = (p.y * ch + y0) / H
+                    p.z = p.z * cw / W
+            side = handed.classification[0]
+            hands.append([lm, side.label, side.score])
+        if len(hands) == 2 and hands[0][1] == hands[1][1]:
+            # MediaPipe sometimes calls both hands the same side; flip the less sure one.
+            weaker = min(hands, key=lambda h: h[2])
+            weaker[1] = 'Left' if weaker[1] == 'Right' else 'Right'
+        return [(lm, side) for lm, side, _ in hands]
+
+    def _roi_around(self, lm, W, H):
+        """Padded square crop around a hand, clipped to the frame."""
+        xs = [p.x * W for p in lm.landmark]
+        ys = [p.y * H for p in lm.landmark]
+        half = max(max(xs) - min(xs), max(ys) - min(ys)) * (0.5 + self.roi_padding)
+        cx, cy = (max(xs) + min(xs)) / 2, (max(ys) + min(ys)) / 2
+        x0, y0 = max(0, int(cx - half)), max(0, int(cy - half))
+        x1, y1 = min(W, int(cx + half) + 1), min(H, int(cy + half) + 1)
+        if x1 - x0 < 32 or y1 - y0 < 32:
+            return None
+        return x0, y0, x1, y1
+
+    def _detect_full(self, frame_bgr):
+        """Detect hands in the whole frame, or in the ROI crop when there is one.
+
+        Crops, and the full-frame retry after a crop miss, go to a separate
+        static-image Hands: the video tracker keeps the last hand's position
+        in the previous input's coordinates and skips palm detection while it
+        has one, so switching it between crop and full frame loses the hand.
+        """
+        self.stats['keyframes'] += 1
+        H, W = frame_bgr.shape[:2]
+        hands = []
+        if self._roi is not None:
+            static_hands = self._get_static_hands()
+            hands = self._process_region(frame_bgr, self._roi, static_hands)
+            self.stats['roi_hits' if hands else 'roi_misses'] += 1
+            if not hands:
+                hands = self._process_region(frame_bgr, (0, 0, W, H), static_hands)
+        else:
+            hands = self._process_region(frame_bgr, (0, 0, W, H))
+        self._roi = None
+        if hands and self.roi_padding is not None:
+            self._roi = self._roi_around(hands[0][0], W, H)
+        return hands
+
+    def _track_landmarks(self, gray):
+        """Propagate the last hand into `gray` with optical flow, or None if lost."""
+        t = time.perf_counter()
+        pts, z = self._track
+        nxt, status, _ = cv2.calcOpticalFlowPyrLK(
+            self._prev_gray, gray, pts, None, winSize=(21, 21), maxLevel=3,
+            criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03))
+        self.latency.record_since('track', t)
+        ok = status.ravel() == 1
+        if ok.mean() < self.min_track_ratio:
+            self.stats['track_lost'] += 1
+            return None
+        nxt[~ok] = pts[~ok]
+        self._track = (nxt, z)
+        h, w = gray.shape
+        lm = landmark_pb2.NormalizedLandmarkList()
+        for (x, y), zi in zip(nxt.reshape(-1, 2), z):
+            lm.landmark.add(x=x / w, y=y / h, z=zi)
+        return lm
+
+    def _detect(self, frame_bgr):
+        """Return this frame's hands as a list of (landmarks, handedness)."""
+        self.stats['frames'] += 1
+        if frame_bgr.shape[:2] != self._frame_shape:
+            # Tracked points and the ROI are in the old frame's pixels.
+            self._track, self._prev_gray, self._roi = None, None, None
+            self._frame_shape = frame_bgr.shape[:2]
+        if self.keyframe_interval <= 1:
+            return self._detect_full(frame_bgr)
+
+        t = time.perf_counter()
+        gray = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2GRAY)
+        self.latency.record_since('convert', t)
+        lm = None
+        if self._track is not None and self._since_keyframe < self.keyframe_interval:
+            lm = self._track_landmarks(gray)
+        if lm is not None:
+            self.stats['tracked'] += 1
+            self._since_keyframe += 1
+        else:
+            hands = self._detect_full(frame_bgr)
+            self._since_keyframe = 1
+            self._track = None
+            lm, self._handedness = hands[0] if hands else (None, None)
+            if lm is not None:
+                h, w = gray.shape
+                pts = np.array([[p.x * w, p.y * h] for p in lm.landmark], dtype=np.float32)
+                z = np.array([p.z for p in lm.landmark], dtype=np.float32)
+                self._track = (pts.reshape(-1, 1, 2), z)
+        self._prev_gray = gray
+        return [(lm, self._handedness)] if lm is not None else []
+
+    def _classify_one(self, vec):
+        """Return (label, confidence) for one (1, 63) vector, via the memo if close."""
+        if self.memo_threshold is not None:
+            if self._memo is not None:
+                diff = vec[0] - self._memo_vec
+                if float(np.dot(diff, diff)) <= self.memo_threshold ** 2:
+                    self.stats['memo_hits'] += 1
+                    return self._memo
+            self.stats['memo_misses'] += 1
+        t = time.perf_counter()
+        pred = self.classify_landmarks(vec)[0]
+        idx = int(np.argmax(pred))
+        result = (self.classes[idx], float(pred[idx]))
+        self.latency.record_since('classify', t)
+        if self.memo_threshold is not None:
+            self._memo_vec[:] = vec[0]
+            self._memo = result
+        return result
+
+    def detect_landmarks(self, frame_bgr):
+        """Find this frame's hands, without classifying them.
+
+        The first half of `predict`: runs detection (with tracking, ROI and
+        the video tracker's state) and returns a list of (landmarks,
+        handedness); `last_landmarks` is updated. Follow it with
+        `apply_results` to smooth the labels the hands were classified as.
+        """
+        hands = self._detect(frame_bgr)
+        self.last_landmarks = hands[0][0] if hands else None
+        self.last_hands = []
+        if not hands:
+            self._memo = None
+        return hands
+
+    def apply_results(self, hands, results):
+        """Smooth per-hand (label, confidence) `results` for `hands` from `detect_landmarks`.
+
+        The second half of `predict`: each label goes through the smoothing
+        buffer, `last_hands` is filled, and the (label, confidence) that
+        `predict` returns is returned (None, 0.0 without hands).
+        """
+        self.last_hands = []
+        if not hands:
+            return None, 0.0
+        for (lm, handed), (label, conf) in zip(hands, results):
+            if self.max_hands == 1:
+                buffer = self.buffer
+            else:
+                buffer = self.hand_buffers.setdefault(handed, deque(maxlen=self.buffer.maxlen))
+            buffer.append(label)
+            self.last_hands.append((handed, Counter(buffer).most_common(1)[0][0], conf, lm))
+        if len(self.last_hands) == 1:
+            _, common, conf, _ = self.last_hands[0]
+        else:
+            ordered = sorted(self.last_hands, key=lambda h: h[3].landmark[0].x)
+            common = ' '.join(str(h[1]) for h in ordered)
+            conf = min(h[2] for h in ordered)
+        return common, conf
+
+    def predict(self, frame_bgr, annotate=True):
         """Run detection on a BGR OpenCV frame.
 
         Returns: (label_or_None, confidence_float, annotated_frame)
         If no hand detected, label is None and annotated_frame is original frame.
-        """
-        rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
-        res = self.hands.process(rgb)
+        With annotate=False nothing is drawn and the original frame is returned.
+        The first detected hand's landmark list is kept in `last_landmarks`.
 
-        if not res.multi_hand_landmarks:
+        Every hand found is kept in `last_hands` as (handedness, label,
+        confidence, landmarks). With `max_hands=2` all hands are classified
+        in one model call and smoothed in their own buffer (per handedness,
+        in `hand_buffers`); the returned label then joins the hands' labels
+        left to right as seen in the frame, with the lowest confidence.
+        """
+        start = time.perf_counter()
+        hands = self.detect_landmarks(frame_bgr)
+        if not hands:
+            self.latency.record_since('predict', start)
             return None, 0.0, frame_bgr
 
-        lm = res.multi_hand_landmarks[0]
-        vec = self._normalize(lm.landmark).reshape(1, -1)
-        pred = self.model.predict(vec, verbose=0)[0]
-        idx = int(np.argmax(pred))
-        label = self.le.inverse_transform([idx])[0]
-        conf = float(pred[idx])
-        self.buffer.append(label)
-        common = Counter(self.buffer).most_common(1)[0][0]
+        t = time.perf_counter()
+        vecs = self._vecs[:len(hands)]
+        for (lm, _), vec in zip(hands, vecs):
+            self._normalize(lm.landmark, out=vec)
+        self.latency.record_since('normalize', t)
+        if len(hands) == 1:
+            results = [self._classify_one(vecs)]
+        else:
+            t = time.perf_counter()
+            probs = self.classify_landmarks(vecs)
+            idx = np.argmax(probs, axis=1)
+            results = [(self.classes[i], float(p[i])) for i, p in zip(idx, probs)]
+            self.latency.record_since('classify', t)
+
+        common, conf = self.apply_results(hands, results)
+        if not annotate:
+            self.latency.record_since('predict', start)
+            return common, conf, frame_bgr
 
+        t = time.perf_counter()
         annotated = frame_bgr.copy()
-        self.mp_draw.draw_landmarks(annotated, lm, self.mp_hands.HAND_CONNECTIONS)
+        H, W = annotated.shape[:2]
+        for handed, label, hand_conf, lm in self.last_hands:
+            self.mp_draw.draw_landmarks(annotated, lm, self.mp_hands.HAND_CONNECTIONS)
+            if len(self.last_hands) > 1:
+                wrist = lm.landmark[0]
+                cv2.putText(annotated, f"{handed}: {label} ({hand_conf:.2f})",
+                            (int(wrist.x * W) - 60, min(H - 10, int(wrist.y * H) + 30)),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
         text = f"{common} ({conf:.2f})"
         cv2.putText(annotated, text, (10, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 3)
+        self.latency.record_since('annotate', t)
+        self.latency.record_since('predict', start)
 
         return common, conf, annotated
 
 
 if __name__ == '__main__':
     # Backwards-compatible CLI that uses the webcam and speaks results.
-    try:
-        import pyttsx3
-    except Exception:
-        pyttsx3 = None
+    from speech import SpeechWorker
 
     detector = Detector()
-    engine = None
-    if pyttsx3:
-        engine = pyttsx3.init()
-        engine.setProperty('rate', 160)
+    # Speech runs on its own thread so the video never freezes mid-utterance.
+    speech = SpeechWorker(rate=160)
 
     last_spoken, last_time = None, 0
 
@@ -106,9 +529,7 @@ if __name__ == '__main__':
         label, conf, annotated = detector.predict(frame)
 
         if label and conf > 0.7 and label != last_spoken and (time.time() - last_time) > 1.5:
-            if engine:
-                engine.say(label)
-                engine.runAndWait()
+            speech.say(label)
             last_spoken = label
             last_time = time.time()
 
@@ -119,3 +540,4 @@ if __name__ == '__main__':
 
     cap.release()
     cv2.destroyAllWindows()
+    speech.close()
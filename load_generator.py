@@ -0,0 +1,118 @@
+"""Concurrent load generator for inference_server.py.
+
+    python load_generator.py --concurrency 1,8,32  # POST /classify, one fixture hand per request
+    python load_generator.py photo.jpg --concurrency 32 --requests 2000
+    python load_generator.py --landmarks 1000      # 1000 hands per request (skips the batcher)
+    python load_generator.py --synthetic           # detection only: the frame has no hand
+
+Each of `--concurrency` clients keeps one keep-alive connection open and
+sends requests back to back. Reports throughput and latency percentiles per
+concurrency level, then the server's batching stats, so the effect of
+micro-batching shows up as higher throughput at higher concurrency. Only
+requests that reach classification are batched: photos with a hand, or
+/classify requests with fewer hands than the server's --max-batch.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import numpy as np
+
+
+async def request(reader, writer, method, path, body=b'', content_type='application/octet-stream'):
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: {content_type}\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ', 2)[1])
+    length = 0
+    for line in lines[1:]:
+        if line.lower().startswith('content-length:'):
+            length = int(line.split(':', 1)[1])
+    return status, json.loads(await reader.readexactly(length)) if length else None
+
+
+async def client(host, port, body, path, content_type, count, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(count):
+            t = time.perf_counter()
+            status, _ = await request(reader, writer, 'POST', path, body, content_type)
+            latencies.append(time.perf_counter() - t)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run_level(host, port, body, path, content_type, concurrency, total, items=1):
+    latencies, errors = [], []
+    per_client = max(1, total // concurrency)
+    start = time.perf_counter()
+    await asyncio.gather(*[client(host, port, body, path, content_type, per_client, latencies, errors)
+                           for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    ms = np.array(latencies) * 1e3
+    p50, p95, p99 = np.percentile(ms, (50, 95, 99))
+    print(f"{concurrency:>12}{len(ms):>10}{len(ms) / elapsed:>12.1f}{items * len(ms) / elapsed:>12.0f}"
+          f"{p50:>9.2f}{p95:>9.2f}{p99:>9.2f}{len(errors):>8}")
+
+
+async def get_json(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        return (await request(reader, writer, 'GET', path))[1]
+    finally:
+        writer.close()
+
+
+def synthetic_image():
+    import cv2
+    rng = np.random.default_rng(0)
+    img = cv2.resize(rng.integers(0, 256, (60, 80, 3), dtype=np.uint8), (640, 480))
+    return cv2.imencode('.jpg', img)[1].tobytes()
+
+
+def landmark_body(n):
+    """n hands from the benchmark fixture as little-endian float32 bytes."""
+    pts = np.load(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'fixtures', 'landmarks.npy'))
+    return np.resize(pts, (n, 21, 3)).astype('<f4').tobytes()
+
+
+async def main(args):
+    items = 1
+    if args.image and not args.landmarks:
+        with open(args.image, 'rb') as f:
+            body = f.read()
+    elif args.synthetic and not args.landmarks:
+        body = synthetic_image()
+    else:
+        items = args.landmarks or 1
+        body = landmark_body(items)
+        args.path, args.content_type = '/classify', 'application/octet-stream'
+    print(f"{'concurrency':>12}{'requests':>10}{'req/s':>12}{'items/s':>12}{'p50':>9}{'p95':>9}{'p99':>9}{'errors':>8}  (ms)")
+    for level in [int(c) for c in args.concurrency.split(',')]:
+        await run_level(args.host, args.port, body, args.path, args.content_type, level, args.requests, items)
+    batching = (await get_json(args.host, args.port, '/stats'))['batching']
+    print(json.dumps(batching, indent=2))
+    if not batching['batches']:
+        print("⚠️ Nothing reached the micro-batcher (no hand detected, or requests of max-batch hands or more)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('image', nargs='?', help='image file to POST to /predict (default: fixture landmarks)')
+    parser.add_argument('--synthetic', action='store_true',
+                        help='POST a generated frame to /predict; it has no hand, so this only loads detection')
+    parser.add_argument('--landmarks', type=int, default=0,
+                        help='raw hands per /classify request (the default without an image is 1)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--path', default='/predict')
+    parser.add_argument('--content-type', default='application/octet-stream')
+    parser.add_argument('--concurrency', default='1,8,32', help='comma-separated client counts')
+    parser.add_argument('--requests', type=int, default=500, help='requests per concurrency level')
+    asyncio.run(main(parser.parse_args()))
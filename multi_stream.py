@@ -0,0 +1,244 @@
+"""Run sign detection on several cameras/streams in one process.
+
+    python multi_stream.py 0 1 rtsp://cam3/stream --threads 3
+    python multi_stream.py 0 1 2 3 --max-per-tick 2 --no-display
+
+Each source gets its own capture thread, MediaPipe tracker and smoothing
+buffer (a Detector sharing one loaded model), but classification is shared:
+every scheduler tick collects the landmark vectors of all streams that
+found a hand and classifies them in one batched call.
+
+Under overload frames are dropped per stream rather than queued: each
+capture thread only keeps its newest frame, so a stream the scheduler
+cannot keep up with skips frames instead of falling behind. With
+`--max-per-tick N` at most N streams are served per tick, starting where
+the previous tick left off, so every stream gets the same share.
+"""
+import os
+os.environ['KERAS_BACKEND'] = 'jax'
+
+import warnings
+warnings.filterwarnings('ignore')
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from landmark_features import FEATURE_DIM, normalize_landmarks
+from live_detection_enhanced import LatestValue
+from live_sign_detect import Detector
+from numpy_engine import DEFAULT_WEIGHTS_PATH
+
+
+class Stream:
+    """One video source: capture thread, its own tracker and latest result."""
+
+    def __init__(self, name, source, detector):
+        self.name = name
+        self.source = source
+        self.detector = detector
+        self.frames = LatestValue()
+        self.seq = 0  # sequence number of the last frame the scheduler took
+        self.frame = None
+        self.label, self.conf = None, 0.0
+        self.done = False
+        self.stats = {'captured': 0, 'processed': 0, 'dropped': 0, 'hands': 0}
+        self._thread = threading.Thread(target=self._capture, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _capture(self):
+        cap = cv2.VideoCapture(self.source)
+        # Recorded files are replayed at their own frame rate, like a camera.
+        is_file = isinstance(self.source, str) and os.path.isfile(self.source)
+        interval = 1.0 / (cap.get(cv2.CAP_PROP_FPS) or 30) if is_file else 0
+        next_time = time.perf_counter()
+        try:
+            while not self.done:
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                if interval:
+                    next_time += interval
+                    time.sleep(max(0.0, next_time - time.perf_counter()))
+                self.stats['captured'] += 1
+                self.frames.put(frame)
+        finally:
+            cap.release()
+            self.done = True
+            self.frames.close()
+
+    def take(self):
+        """Return the newest unprocessed frame (counting skipped ones as dropped), or None."""
+        seq, frame = self.frames.peek()
+        if seq <= self.seq:
+            return None
+        self.stats['dropped'] += seq - self.seq - 1
+        self.seq = seq
+        return frame
+
+
+class MultiStreamRunner:
+    """Schedule N streams over one shared classifier.
+
+    `threads` runs the per-stream hand detection of a tick in parallel
+    (each stream has its own Hands, so they never share state).
+    """
+
+    def __init__(self, sources, detector_kwargs=None, max_per_tick=None, threads=1):
+        detector_kwargs = detector_kwargs or {}
+        # The first stream's Detector loads the model; the others share it, so
+        # there is one model and one Hands graph per stream, nothing more.
+        self.streams = []
+        for s in sources:
+            shared = {'classifier': self.streams[0].detector} if self.streams else {}
+            self.streams.append(Stream(str(s), s, Detector(**shared, **detector_kwargs)))
+        self.classifier = self.streams[0].detector
+        self.max_per_tick = max_per_tick or len(self.streams)
+        self.pool = ThreadPoolExecutor(threads) if threads > 1 else None
+        self._vecs = np.empty((len(self.streams), FEATURE_DIM), dtype=np.float32)
+        self._next = 0  # round-robin start for the next tick
+        self.ticks = 0
+        self.batches = 0
+
+    def start(self):
+        for stream in self.streams:
+            stream.start()
+
+    def _detect(self, item):
+        stream, frame = item
+        hands = stream.detector.detect_landmarks(frame)
+        return hands[0] if hands else None
+
+    def tick(self):
+        """Serve up to `max_per_tick` streams with new frames; returns the streams served."""
+        n = len(self.streams)
+        batch = []
+        for i in range(n):
+            stream = self.streams[(self._next + i) % n]
+            frame = stream.take()
+            if frame is None:
+                continue
+            stream.frame = frame
+            batch.append((stream, frame))
+            if len(batch) == self.max_per_tick:
+                self._next = (self._next + i + 1) % n
+                break
+        if not batch:
+            return []
+        self.ticks += 1
+
+        results = self.pool.map(self._detect, batch) if self.pool else map(self._detect, batch)
+        found = []
+        for (stream, _), hand in zip(batch, results):
+            stream.stats['processed'] += 1
+            if hand is None:
+                stream.label, stream.conf = stream.detector.apply_results([], [])
+                continue
+            normalize_landmarks(hand[0].landmark, out=self._vecs[len(found)])
+            found.append((stream, hand))
+
+        if found:
+            probs = self.classifier.classify_landmarks(self._vecs[:len(found)])
+            self.batches += 1
+            idx = np.argmax(probs, axis=1)
+            for (stream, hand), i, p in zip(found, idx, probs):
+                stream.stats['hands'] += 1
+                stream.label, stream.conf = stream.detector.apply_results(
+                    [hand], [(self.classifier.classes[i], float(p[i]))])
+        return [stream for stream, _ in batch]
+
+    def mosaic(self, tile_width=480):
+        """All streams' latest frames, annotated, tiled into one image."""
+        tiles = []
+        for stream in self.streams:
+            if stream.frame is None:
+                continue
+            h, w = stream.frame.shape[:2]
+            tile = cv2.resize(stream.frame, (tile_width, int(h * tile_width / w)))
+            lm = stream.detector.last_landmarks
+            if lm is not None:
+                stream.detector.mp_draw.draw_landmarks(tile, lm, stream.detector.mp_hands.HAND_CONNECTIONS)
+            text = f"{stream.name}: {stream.label} ({stream.conf:.2f})" if stream.label else stream.name
+            cv2.putText(tile, text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+            tiles.append(tile)
+        if not tiles:
+            return None
+        cols = int(np.ceil(np.sqrt(len(tiles))))
+        height = max(t.shape[0] for t in tiles)
+        tiles = [cv2.copyMakeBorder(t, 0, height - t.shape[0], 0, 0, cv2.BORDER_CONSTANT) for t in tiles]
+        tiles += [np.zeros_like(tiles[0])] * (-len(tiles) % cols)
+        return np.vstack([np.hstack(tiles[r:r + cols]) for r in range(0, len(tiles), cols)])
+
+    def run(self, display=True, on_result=None):
+        """Tick until every stream has ended (or 'q' is pressed in the window).
+
+        `on_result(stream)` is called for each stream served in a tick.
+        """
+        self.start()
+        start = time.time()
+        try:
+            while not all(s.done and s.frames.peek()[0] <= s.seq for s in self.streams):
+                served = self.tick()
+                for stream in served:
+                    if on_result:
+                        on_result(stream)
+                if display:
+                    view = self.mosaic()
+                    if view is not None:
+                        cv2.imshow('Multi-stream Sign Detection', view)
+                    if cv2.waitKey(1) & 0xFF == ord('q'):
+                        break
+                elif not served:
+                    time.sleep(0.001)
+        finally:
+            for stream in self.streams:
+                stream.done = True
+            if self.pool:
+                self.pool.shutdown()
+            if display:
+                cv2.destroyAllWindows()
+        self.report(time.time() - start)
+
+    def report(self, elapsed):
+        print(f"\n{'stream':<24}{'captured':>10}{'processed':>11}{'dropped':>9}{'hands':>7}{'fps':>8}")
+        for s in self.streams:
+            st = s.stats
+            print(f"{s.name[-24:]:<24}{st['captured']:>10}{st['processed']:>11}{st['dropped']:>9}"
+                  f"{st['hands']:>7}{st['processed'] / max(elapsed, 1e-9):>8.1f}")
+        print(f"{self.ticks} ticks, {self.batches} classifier calls in {elapsed:.1f}s")
+
+
+def parse_source(source):
+    return int(source) if source.isdigit() else source
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('sources', nargs='+', help='camera indices, video files or stream URLs')
+    parser.add_argument('--max-per-tick', type=int, default=None,
+                        help='serve at most this many streams per tick (round-robin)')
+    parser.add_argument('--threads', type=int, default=1, help='parallel hand-detection threads')
+    parser.add_argument('--no-display', action='store_true', help='print labels instead of showing a window')
+    parser.add_argument('--keyframe-interval', type=int, default=1)
+    parser.add_argument('--detect-max-side', type=int, default=None)
+    parser.add_argument('--weights', default=DEFAULT_WEIGHTS_PATH,
+                        help='NumPy engine weights, e.g. a quantize_model.py output')
+    args = parser.parse_args()
+
+    runner = MultiStreamRunner([parse_source(s) for s in args.sources],
+                               detector_kwargs={'keyframe_interval': args.keyframe_interval,
+                                                'detect_max_side': args.detect_max_side,
+                                                'weights_path': args.weights},
+                               max_per_tick=args.max_per_tick, threads=args.threads)
+
+    def print_label(stream):
+        if stream.label:
+            print(f"{stream.name}: {stream.label} ({stream.conf:.2f})")
+
+    runner.run(display=not args.no_display, on_result=print_label if args.no_display else None)
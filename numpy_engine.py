@@ -0,0 +1,116 @@
+"""NumPy-only inference for the landmark classifier.
+
+The trained Keras MLP is just a stack of Dense layers, so once its weights
+are exported (see export_weights.py) the forward pass needs nothing but
+NumPy. Importing this module does not pull in Keras or JAX.
+
+Usage:
+  clf = NumpyClassifier('sign_model_weights.npz')
+  probs = clf.predict(vectors)          # (N, 63) -> (N, classes)
+  labels = clf.classes[probs.argmax(axis=1)]
+"""
+import os
+import pickle
+
+import numpy as np
+
+DEFAULT_WEIGHTS_PATH = 'sign_model_weights.npz'
+
+
+def _relu(x):
+    return np.maximum(x, 0, out=x)
+
+
+def _softmax(x):
+    x -= x.max(axis=1, keepdims=True)
+    np.exp(x, out=x)
+    x /= x.sum(axis=1, keepdims=True)
+    return x
+
+
+def _linear(x):
+    return x
+
+
+ACTIVATIONS = {'relu': _relu, 'softmax': _softmax, 'linear': _linear}
+
+
+def _load_kernel(data, i):
+    """Layer i's kernel as float32, dequantizing float16/int8 files."""
+    W = data[f'W{i}']
+    if f'S{i}' in data:  # int8 with one float32 scale per output channel
+        return np.ascontiguousarray(W.astype(np.float32) * data[f'S{i}'])
+    return np.ascontiguousarray(W, dtype=np.float32)
+
+
+class NumpyClassifier:
+    """Dense-layer stack loaded from an exported .npz weights file.
+
+    The file holds `W{i}`/`b{i}` for each layer, an `activations` array of
+    names and the label table as `classes`. Quantized files written by
+    quantize_model.py (float16 kernels, or int8 kernels with per-channel
+    scales `S{i}`) load the same way; kernels are dequantized to float32
+    once at load, so quantization only shrinks the file: memory use and
+    prediction speed are the same as float32. `quantization` names the
+    file's format.
+    """
+
+    def __init__(self, weights_path=DEFAULT_WEIGHTS_PATH):
+        with np.load(weights_path) as data:
+            self.activations = [str(a) for a in data['activations']]
+            self.layers = [(_load_kernel(data, i), np.ascontiguousarray(data[f'b{i}'], dtype=np.float32))
+                           for i in range(len(self.activations))]
+            self.classes = data['classes']
+            self.quantization = str(data['quantization']) if 'quantization' in data else 'float32'
+        for name in self.activations:
+            if name not in ACTIVATIONS:
+                raise ValueError(f"Unsupported activation '{name}' in {weights_path}")
+
+    @property
+    def input_dim(self):
+        return self.layers[0][0].shape[0]
+
+    def predict(self, x, verbose=0):
+        """Return class probabilities for an (N, input_dim) batch.
+
+        Mirrors `keras.Model.predict` so callers can swap the two; `verbose`
+        is accepted and ignored.
+        """
+        x = np.asarray(x, dtype=np.float32).reshape(-1, self.input_dim)
+        for (W, b), name in zip(self.layers, self.activations):
+            x = x @ W
+            x += b
+            x = ACTIVATIONS[name](x)
+        return x
+
+
+def check_labels(classes, labels_path, weights_path=DEFAULT_WEIGHTS_PATH):
+    """Raise ValueError if a weights file's `classes` differ from the encoder in `labels_path`.
+
+    Callers that decode predictions with labels.pkl would otherwise get
+    silently wrong labels from weights exported before the last training.
+    A missing `labels_path` is not checked.
+    """
+    if not labels_path or not os.path.exists(labels_path):
+        return
+    with open(labels_path, 'rb') as f:
+        expected = np.asarray(pickle.load(f).classes_).astype(str)
+    if list(expected) != list(np.asarray(classes).astype(str)):
+        raise ValueError(f"{weights_path} labels do not match {labels_path}; re-run "
+                         f"export_weights.py, or pass labels_path=None to use the file's own")
+
+
+def load_classifier(model_path='sign_model.h5', weights_path=DEFAULT_WEIGHTS_PATH, labels_path='labels.pkl'):
+    """Return the NumPy engine if exported weights exist, else the Keras model.
+
+    Both expose `predict(x, verbose=0)`. Keras is only imported on fallback.
+    The NumPy engine's label table is checked against `labels_path` (see
+    `check_labels`), since callers decode its indices with that encoder.
+    """
+    if os.path.exists(weights_path):
+        clf = NumpyClassifier(weights_path)
+        check_labels(clf.classes, labels_path, weights_path)
+        return clf
+    os.environ.setdefault('KERAS_BACKEND', 'jax')
+    import keras
+    return keras.models.load_model(model_path)
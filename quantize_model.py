@@ -0,0 +1,122 @@
+"""Post-training quantization of the exported classifier weights.
+
+    python quantize_model.py                          # float16 + int8 files and a report
+    python quantize_model.py --modes int8 --weights sign_model_weights.npz
+
+Reads the float32 weights written by export_weights.py and writes
+`<name>_fp16.npz` and `<name>_int8.npz` next to them:
+
+  fp16  every kernel cast to float16 (half the size)
+  int8  symmetric per-output-channel quantization: column j of a kernel is
+        stored as round(W[:, j] / s_j) in int8 with s_j = max|W[:, j]| / 127,
+        and the float32 scales saved as S{i} (about a quarter of the size)
+
+Biases stay float32. Either file is a drop-in weights path for
+NumpyClassifier / Detector(weights_path=...). The engine dequantizes the
+kernels to float32 when it loads them (NumPy has no fast int8/float16
+matmul), so the saving is on disk and in download size only; runtime
+memory and latency match float32.
+
+The report scores every variant on the held-out split train_model.py
+validates on (same seed, see landmark_dataset.held_out_split): accuracy,
+its delta vs float32, top-1 agreement with float32, the largest
+probability difference, file size and batch-1024 latency. Without the training data it falls
+back to agreement on the benchmark landmark fixture.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from numpy_engine import DEFAULT_WEIGHTS_PATH, NumpyClassifier
+
+MODES = ('fp16', 'int8')
+
+
+def quantized_path(weights_path, mode):
+    root, ext = os.path.splitext(weights_path)
+    return f'{root}_{mode}{ext}'
+
+
+def quantize_kernel_int8(W):
+    """Return (int8 kernel, float32 per-output-channel scales) for W (in, out)."""
+    scale = np.abs(W).max(axis=0) / 127.0
+    scale[scale == 0] = 1.0
+    q = np.clip(np.round(W / scale), -127, 127).astype(np.int8)
+    return q, scale.astype(np.float32)
+
+
+def quantize(weights_path=DEFAULT_WEIGHTS_PATH, mode='int8', out_path=None):
+    """Write a `mode` ('fp16' or 'int8') copy of `weights_path`; returns its path."""
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode '{mode}' (expected one of {', '.join(MODES)})")
+    out_path = out_path or quantized_path(weights_path, mode)
+    with np.load(weights_path) as data:
+        arrays = {name: data[name] for name in data.files}
+    for i in range(len(arrays['activations'])):
+        W = arrays[f'W{i}'].astype(np.float32)
+        if mode == 'fp16':
+            arrays[f'W{i}'] = W.astype(np.float16)
+        else:
+            arrays[f'W{i}'], arrays[f'S{i}'] = quantize_kernel_int8(W)
+    arrays['quantization'] = np.array(mode)
+    np.savez(out_path, **arrays)
+    return out_path
+
+
+def evaluation_data():
+    """Return (X_val, labels_or_None, description) for the report."""
+    from landmark_dataset import CSV_PATH, DATASET_DIR, held_out_split, load_training_data
+    if os.path.isdir(DATASET_DIR) or os.path.exists(CSV_PATH):
+        X, y, classes = load_training_data()
+        _, X_val, _, y_val = held_out_split(X, y)
+        labels = np.asarray(classes).astype(str)[y_val]
+        return np.asarray(X_val, dtype=np.float32), labels, f'held-out split ({len(X_val)} rows)'
+    from landmark_features import normalize_batch
+    fixture = np.load(os.path.join('benchmarks', 'fixtures', 'landmarks.npy'))
+    return normalize_batch(fixture), None, f'benchmark fixture ({len(fixture)} rows, no labels)'
+
+
+def batch_latency_ms(clf, X, n=1024, repeats=50):
+    x = np.resize(X, (n, X.shape[1]))
+    clf.predict(x)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        clf.predict(x)
+    return (time.perf_counter() - start) / repeats * 1e3
+
+
+def report(paths, X, labels, description):
+    """Print accuracy/agreement of each weights file against the first (float32) one."""
+    print(f"Evaluated on {description}")
+    print(f"{'variant':<10}{'size KB':>9}{'accuracy':>10}{'delta':>9}{'agree':>9}{'max |dp|':>10}{'1024 ms':>9}")
+    ref_probs = None
+    ref_acc = None
+    for path in paths:
+        clf = NumpyClassifier(path)
+        probs = clf.predict(X)
+        pred = probs.argmax(axis=1)
+        if ref_probs is None:
+            ref_probs, ref_pred = probs, pred
+        acc = float((clf.classes[pred] == labels).mean()) if labels is not None else None
+        if ref_acc is None:
+            ref_acc = acc
+        acc_text = f"{acc:>10.2%}{acc - ref_acc:>+9.2%}" if acc is not None else f"{'-':>10}{'-':>9}"
+        print(f"{clf.quantization:<10}{os.path.getsize(path) / 1024:>9.1f}{acc_text}"
+              f"{(pred == ref_pred).mean():>9.2%}{np.abs(probs - ref_probs).max():>10.2e}"
+              f"{batch_latency_ms(clf, X):>9.3f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--weights', default=DEFAULT_WEIGHTS_PATH, help='float32 weights from export_weights.py')
+    parser.add_argument('--modes', default=','.join(MODES), help='comma-separated: ' + ', '.join(MODES))
+    parser.add_argument('--no-report', action='store_true')
+    args = parser.parse_args()
+
+    paths = [quantize(args.weights, mode) for mode in args.modes.split(',')]
+    for path in paths:
+        print(f"✅ Wrote {path}")
+    if not args.no_report:
+        report([args.weights] + paths, *evaluation_data())
@@ -0,0 +1,384 @@
+"""Background text-to-speech for the live detectors.
+
+pyttsx3's `runAndWait()` blocks for the whole utterance, which froze the
+video loop. SpeechWorker owns one engine on its own thread and takes
+requests through a small bounded queue:
+
+  speech = SpeechWorker(rate=150)
+  speech.say('A')      # returns immediately
+  speech.close()
+
+Requests for the label already pending or being spoken are coalesced, and
+when the queue is full the oldest pending label is dropped as stale, since
+a newer sign has arrived.
+
+For apps that play audio in the browser instead, AudioBank turns labels into
+audio bytes through a pluggable synthesizer (gTTS, pyttsx3 or an offline
+stub) and keeps the results in memory and on disk, keyed by label and voice
+settings. The vocabulary is fixed, so it can be generated once up front:
+
+  python speech.py --synth gtts        # fill audio_cache/ for every label
+"""
+import base64
+import hashlib
+import io
+import json
+import math
+import os
+import struct
+import tempfile
+import threading
+import time
+import wave
+from collections import deque
+from concurrent.futures import Future
+
+AUDIO_CACHE_DIR = 'audio_cache'
+
+
+def pyttsx3_engine(rate=150, volume=None):
+    import pyttsx3
+    engine = pyttsx3.init()
+    engine.setProperty('rate', rate)
+    if volume is not None:
+        engine.setProperty('volume', volume)
+    return engine
+
+
+class SpeechWorker:
+    """Speak text on a dedicated thread without ever blocking the caller.
+
+    `engine_factory` is called on the worker thread (pyttsx3 engines must be
+    used from the thread that created them) and must return an object with
+    `say(text)` and `runAndWait()`. If it raises, the worker stays
+    unavailable and `say` returns False.
+
+    If a LatencyStats is given as `latency`, each utterance started with a
+    `stamp` (the perf_counter() time its frame was captured) records the
+    capture-to-speech delay as 'glass_to_speech'.
+
+    `render(text)` renders to WAV bytes on the same thread and engine (it
+    needs `save_to_file`), since pyttsx3 hands out one engine per process and
+    it must not be driven from two threads at once. Render jobs are never
+    dropped and run before pending utterances.
+    """
+
+    def __init__(self, rate=150, volume=None, maxsize=1, engine_factory=None, latency=None):
+        self._factory = engine_factory or (lambda: pyttsx3_engine(rate, volume))
+        self._pending = deque()
+        self._jobs = deque()  # render jobs: (text, path, done event, [error])
+        self._maxsize = maxsize
+        self._cond = threading.Condition()
+        self._closed = False
+        self._current = None
+        self.latency = latency
+        self.available = True
+        self.spoken = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=5.0)
+
+    @property
+    def speaking(self):
+        return self._current is not None
+
+    def say(self, text, stamp=None):
+        """Queue `text`; returns True if it was queued or already pending."""
+        if not self.available:
+            return False
+        with self._cond:
+            if text == self._current or any(text == t for t, _ in self._pending):
+                self.coalesced += 1
+                return True
+            while len(self._pending) >= self._maxsize:
+                self._pending.popleft()
+                self.dropped += 1
+            self._pending.append((text, stamp))
+            self._cond.notify()
+        return True
+
+    def render(self, text, timeout=60.0):
+        """Synthesize `text` to WAV bytes on the worker's engine thread."""
+        if not self.available:
+            raise RuntimeError('speech engine unavailable')
+        fd, path = tempfile.mkstemp(suffix='.wav')
+        os.close(fd)
+        job = (text, path, threading.Event(), [])
+        try:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError('speech worker closed')
+                self._jobs.append(job)
+                self._cond.notify()
+            if not job[2].wait(timeout):
+                raise TimeoutError(f'rendering {text!r} took over {timeout:g}s')
+            if job[3]:
+                raise job[3][0]
+            with open(path, 'rb') as f:
+                return f.read()
+        finally:
+            os.remove(path)
+
+    def stats(self):
+        with self._cond:
+            return {'spoken': self.spoken, 'coalesced': self.coalesced, 'dropped': self.dropped,
+                    'pending': len(self._pending), 'speaking': self._current is not None}
+
+    def close(self, timeout=1.0):
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            self._cond.notify()
+        self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            engine = self._factory()
+        except Exception:
+            self.available = False
+            return
+        finally:
+            self._ready.set()
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._jobs or self._closed)
+                if self._closed:
+                    for _, _, done, error in self._jobs:
+                        error.append(RuntimeError('speech worker closed'))
+                        done.set()
+                    return
+                job = self._jobs.popleft() if self._jobs else None
+                if job is None:
+                    self._current, stamp = self._pending.popleft()
+            if job is not None:
+                text, path, done, error = job
+                try:
+                    engine.save_to_file(text, path)
+                    engine.runAndWait()
+                except Exception as e:
+                    error.append(e)
+                finally:
+                    done.set()
+                continue
+            if stamp is not None and self.latency is not None:
+                self.latency.record_since('glass_to_speech', stamp)
+            try:
+                engine.say(self._current)
+                engine.runAndWait()
+                self.spoken += 1
+            except Exception:
+                pass
+            finally:
+                with self._cond:
+                    self._current = None
+
+
+class FrameTimer:
+    """Rolling frame-interval stats, split by whether speech was active.
+
+    Used to check that speaking does not stall the frame loop: the jitter
+    while speaking should match the jitter while silent.
+    """
+
+    def __init__(self, maxlen=300):
+        self._last = None
+        self.intervals = {False: deque(maxlen=maxlen), True: deque(maxlen=maxlen)}
+
+    def tick(self, speaking=False):
+        now = time.perf_counter()
+        if self._last is not None:
+            self.intervals[bool(speaking)].append(now - self._last)
+        self._last = now
+
+    def summary(self):
+        """Return {'silent'|'speaking': (mean_ms, std_ms, max_ms, n)}."""
+        out = {}
+        for speaking, values in self.intervals.items():
+            if not values:
+                continue
+            n = len(values)
+            mean = sum(values) / n
+            std = (sum((v - mean) ** 2 for v in values) / n) ** 0.5
+            out['speaking' if speaking else 'silent'] = (mean * 1e3, std * 1e3, max(values) * 1e3, n)
+        return out
+
+
+# -- synthesizers for pre-rendered audio -----------------------------------
+# Each has `name`, `settings` (part of the cache key), `mime`, `ext` and
+# `synthesize(text) -> bytes`.
+
+class GTTSSynthesizer:
+    """Google Text-to-Speech MP3s (needs network access)."""
+    name, mime, ext = 'gtts', 'audio/mp3', 'mp3'
+
+    def __init__(self, lang='en', slow=False):
+        self.settings = {'lang': lang, 'slow': slow}
+
+    def synthesize(self, text):
+        from gtts import gTTS
+        buf = io.BytesIO()
+        gTTS(text=text, **self.settings).write_to_fp(buf)
+        return buf.getvalue()
+
+
+class Pyttsx3Synthesizer:
+    """Offline WAVs from the local pyttsx3 engine.
+
+    Rendering goes through a SpeechWorker's engine thread. Pass the worker
+    that also speaks (`worker=`) when both are used in one process: pyttsx3
+    has a single engine per process, so it must only be driven from one
+    thread. Without one, a worker is started on first use.
+    """
+    name, mime, ext = 'pyttsx3', 'audio/wav', 'wav'
+
+    def __init__(self, rate=150, volume=None, worker=None):
+        self.settings = {'rate': rate, 'volume': volume}
+        self._worker = worker
+
+    def synthesize(self, text):
+        if self._worker is None:
+            self._worker = SpeechWorker(**self.settings)
+        return self._worker.render(text)
+
+
+class StubSynthesizer:
+    """Deterministic short tone per text; no dependencies, for tests and offline use."""
+    name, mime, ext = 'stub', 'audio/wav', 'wav'
+
+    def __init__(self, sample_rate=8000, duration=0.2):
+        self.settings = {'sample_rate': sample_rate, 'duration': duration}
+
+    def synthesize(self, text):
+        rate, n = self.settings['sample_rate'], int(self.settings['sample_rate'] * self.settings['duration'])
+        freq = 300 + int(hashlib.sha1(text.encode()).hexdigest()[:4], 16) % 600
+        frames = b''.join(struct.pack('<h', int(8000 * math.sin(2 * math.pi * freq * i / rate)))
+                          for i in range(n))
+        buf = io.BytesIO()
+        with wave.open(buf, 'wb') as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(rate)
+            w.writeframes(frames)
+        return buf.getvalue()
+
+
+SYNTHESIZERS = {'gtts': GTTSSynthesizer, 'pyttsx3': Pyttsx3Synthesizer, 'stub': StubSynthesizer}
+
+
+def make_synthesizer(name='gtts', **settings):
+    try:
+        return SYNTHESIZERS[name](**settings)
+    except KeyError:
+        raise ValueError(f"Unknown synthesizer '{name}' (expected one of {', '.join(SYNTHESIZERS)})")
+
+
+class AudioBank:
+    """Audio for a fixed vocabulary, synthesized once and then looked up.
+
+    Lookups go memory -> `cache_dir` -> synthesizer. Files live under a
+    directory named after the synthesizer and a hash of its settings, so
+    changing the voice never serves stale audio. Safe to share between
+    threads (e.g. Streamlit sessions): each text is synthesized once, with
+    concurrent lookups of the same text waiting on that one call and lookups
+    of other texts never waiting behind it (e.g. behind `pregenerate`).
+    """
+
+    def __init__(self, synthesizer, cache_dir=AUDIO_CACHE_DIR):
+        self.synthesizer = synthesizer
+        key = hashlib.sha1(json.dumps(synthesizer.settings, sort_keys=True).encode()).hexdigest()[:10]
+        self.dir = os.path.join(cache_dir, f'{synthesizer.name}-{key}') if cache_dir else None
+        self._memory = {}
+        self._inflight = {}  # text -> Future, while it is loaded or synthesized
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, text):
+        return os.path.join(self.dir, hashlib.sha1(text.encode()).hexdigest() + '.' + self.synthesizer.ext)
+
+    def get(self, text):
+        """Audio bytes for `text`."""
+        audio = self._memory.get(text)
+        if audio is not None:
+            self.hits += 1
+            return audio
+        with self._lock:
+            audio = self._memory.get(text)
+            pending = self._inflight.get(text)
+            if audio is not None or pending is not None:
+                self.hits += 1
+            else:
+                self._inflight[text] = future = Future()
+                self.misses += 1
+        if audio is not None:
+            return audio
+        if pending is not None:
+            return pending.result()
+        try:
+            audio = self._load_or_synthesize(text)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            self._memory[text] = audio
+            future.set_result(audio)
+            return audio
+        finally:
+            with self._lock:
+                del self._inflight[text]
+
+    def _load_or_synthesize(self, text):
+        if self.dir:
+            try:
+                with open(self._path(text), 'rb') as f:
+                    return f.read()
+            except OSError:
+                pass
+        audio = self.synthesizer.synthesize(text)
+        if self.dir:
+            os.makedirs(self.dir, exist_ok=True)
+            tmp = self._path(text) + '.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(audio)
+            os.replace(tmp, self._path(text))
+        return audio
+
+    def data_uri(self, text):
+        """`data:` URI for an <audio> tag; the base64 encoding is cached too."""
+        key = ('uri', text)
+        uri = self._memory.get(key)
+        if uri is None:
+            uri = f"data:{self.synthesizer.mime};base64,{base64.b64encode(self.get(text)).decode()}"
+            self._memory[key] = uri
+        return uri
+
+    def pregenerate(self, texts):
+        """Fill the bank for every text; returns how many could not be synthesized."""
+        failed = 0
+        for text in texts:
+            try:
+                self.get(str(text))
+            except Exception:
+                failed += 1
+        return failed
+
+
+if __name__ == '__main__':
+    import argparse
+    from numpy_engine import DEFAULT_WEIGHTS_PATH, NumpyClassifier
+
+    parser = argparse.ArgumentParser(description='Pre-generate spoken audio for every gesture label')
+    parser.add_argument('--synth', default='gtts', choices=sorted(SYNTHESIZERS))
+    parser.add_argument('--weights', default=DEFAULT_WEIGHTS_PATH, help='label table source')
+    parser.add_argument('--cache-dir', default=AUDIO_CACHE_DIR)
+    args = parser.parse_args()
+
+    labels = [str(c) for c in NumpyClassifier(args.weights).classes]
+    bank = AudioBank(make_synthesizer(args.synth), args.cache_dir)
+    start = time.perf_counter()
+    failed = bank.pregenerate(labels)
+    print(f"{'❌' if failed else '✅'} {len(labels) - failed}/{len(labels)} labels in {bank.dir} "
+          f"({time.perf_counter() - start:.1f}s)")
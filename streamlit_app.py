@@ -5,12 +5,17 @@ warnings.filterwarnings('ignore')
 
 import streamlit as st
 import numpy as np
-from PIL import Image
 import mediapipe as mp
-import keras
 import pickle
-import pyttsx3
-import threading
+import hashlib
+from detector_pool import DetectorPool, PoolTimeout
+from image_preprocess import load_image, rgb_array
+from landmark_features import normalize_landmarks
+from landmark_overlay import MODES, PREVIEW_SIDE, draw_landmarks, landmark_points, overlay_html
+from numpy_engine import load_classifier
+from speech import SpeechWorker
+
+RESULT_CACHE_ENTRIES = 128
 
 st.set_page_config(page_title="Sign Language Detection", page_icon="🤟", layout="wide", initial_sidebar_state="expanded")
 
@@ -162,6 +167,8 @@ if 'voice_enabled' not in st.session_state:
     st.session_state.voice_enabled = True
 if 'subtitles_enabled' not in st.session_state:
     st.session_state.subtitles_enabled = True
+if 'overlay_mode' not in st.session_state:
+    st.session_state.overlay_mode = 'vector'
 if 'detection_count' not in st.session_state:
     st.session_state.detection_count = 0
 if 'last_gesture' not in st.session_state:
@@ -169,54 +176,86 @@ if 'last_gesture' not in st.session_state:
 
 @st.cache_resource
 def load_model():
-    model = keras.models.load_model('sign_model.h5')
+    model = load_classifier('sign_model.h5')
     with open('labels.pkl', 'rb') as f:
         le = pickle.load(f)
     mp_hands = mp.solutions.hands
-    hands = mp_hands.Hands(static_image_mode=True, max_num_hands=1, min_detection_confidence=0.7)
-    return model, le, hands
+    # One Hands graph per concurrent session, up to SIGN_HANDS_POOL (default: core count, at most 4).
+    pool = DetectorPool(lambda: mp_hands.Hands(static_image_mode=True, max_num_hands=1, min_detection_confidence=0.7),
+                        size=int(os.environ.get('SIGN_HANDS_POOL', 0)) or None)
+    return model, le, pool
+
+@st.cache_resource
+def get_speech_worker():
+    # One engine on one thread for the whole server; overlapping requests coalesce.
+    return SpeechWorker(rate=150)
 
 def speak_gesture(text):
-    try:
-        engine = pyttsx3.init()
-        engine.setProperty('rate', 150)
-        engine.say(text)
-        engine.runAndWait()
-    except:
-        pass
+    get_speech_worker().say(text)
+
+def show_landmarks(image, points, caption=None, width=None):
+    """The photo with its hand landmarks, in the sidebar's display mode (landmark_overlay.py)."""
+    mode = st.session_state.overlay_mode
+    if mode == 'vector':
+        st.markdown(overlay_html(image, points, width=width, caption=caption), unsafe_allow_html=True)
+        return
+    annotated = draw_landmarks(image, points, PREVIEW_SIDE if mode == 'preview' else None)
+    if width:
+        st.image(annotated, caption=caption, width=width)
+    else:
+        st.image(annotated, caption=caption, use_container_width=True)
 
 def predict_gesture(image_pil, model, le, hands):
-    img_array = np.array(image_pil)
-    if img_array.shape[2] == 4:
-        img_array = img_array[:, :, :3]
+    # RGB view of the already downscaled photo (image_preprocess.py)
+    img_array = rgb_array(image_pil)
     
     res = hands.process(img_array)
     
     if res.multi_hand_landmarks:
         hand_landmarks = res.multi_hand_landmarks[0]
-        landmarks = []
-        for lm in hand_landmarks.landmark:
-            landmarks.extend([lm.x, lm.y, lm.z])
-        landmarks = np.array(landmarks).reshape(1, -1)
+        # Same features the model was trained on (landmark_features.py)
+        landmarks = normalize_landmarks(hand_landmarks.landmark).reshape(1, -1)
         
         prediction = model.predict(landmarks, verbose=0)
         predicted_class = np.argmax(prediction, axis=1)
         confidence = float(np.max(prediction))
         label = le.inverse_transform(predicted_class)[0]
         
-        annotated = img_array.copy()
-        mp_drawing = mp.solutions.drawing_utils
-        mp_drawing_styles = mp.solutions.drawing_styles
-        mp_drawing.draw_landmarks(
-            annotated,
-            hand_landmarks,
-            mp.solutions.hands.HAND_CONNECTIONS,
-            mp_drawing_styles.get_default_hand_landmarks_style(),
-            mp_drawing_styles.get_default_hand_connections_style()
-        )
-        
-        return label, confidence, Image.fromarray(annotated)
-    return None, None, image_pil
+        return label, confidence, image_pil, landmark_points(hand_landmarks)
+    return None, None, image_pil, None
+
+@st.cache_data(max_entries=RESULT_CACHE_ENTRIES, show_spinner=False)
+def cached_prediction(image_digest, _image_bytes):
+    """`predict_gesture` on an encoded image, cached by its content hash.
+
+    The cache is shared by every session and holds at most
+    RESULT_CACHE_ENTRIES results (the oldest are evicted), so reruns from
+    sidebar toggles, and the same photo uploaded again, skip MediaPipe and
+    the model entirely.
+    """
+    model, le, pool = load_model()
+    image = load_image(_image_bytes)
+    with pool.checkout() as hands:
+        return predict_gesture(image, model, le, hands)
+
+def detect(image_digest, image_bytes):
+    """`cached_prediction`, or a busy message (and stop) if no detector frees up in time."""
+    try:
+        return cached_prediction(image_digest, image_bytes)
+    except PoolTimeout:
+        st.error("⏳ Server busy: every hand detector is in use. Please try again in a moment.")
+        st.stop()
+
+def is_new_image(source, image_digest):
+    """True the first time this session sees `image_digest` from `source`.
+
+    Reruns keep the same image, so counting and speaking only happen here.
+    """
+    key = f'last_image_{source}'
+    if st.session_state.get(key) == image_digest:
+        return False
+    st.session_state[key] = image_digest
+    return True
 
 st.markdown("<h1>🤟 Sign Language Detection System</h1>", unsafe_allow_html=True)
 st.markdown("<h2>Upload Photo for Hand Gesture Recognition with Voice & Subtitles</h2>", unsafe_allow_html=True)
@@ -229,6 +268,11 @@ with st.sidebar:
     
     st.markdown("#### 💬 Show Gesture")
     st.session_state.subtitles_enabled = st.toggle("Show Detected Gesture", value=st.session_state.subtitles_enabled)
+    st.markdown("#### 🖐️ Landmarks")
+    st.session_state.overlay_mode = st.radio(
+        "Landmark display", MODES, index=MODES.index(st.session_state.overlay_mode), horizontal=True,
+        label_visibility="collapsed",
+        help="vector: drawn over the photo in the browser; preview: small annotated copy; full: full-size annotated copy")
     
     st.markdown("---")
     st.markdown("### 📊 Statistics")
@@ -238,6 +282,9 @@ with st.sidebar:
         <div class='stat-label'>Detections</div>
     </div>
     """, unsafe_allow_html=True)
+    pool_stats = load_model()[2].stats()
+    st.caption(f"🧵 Detectors in use: {pool_stats['in_use']}/{pool_stats['size']} "
+               f"(peak {pool_stats['peak_in_use']}, waited {pool_stats['waits']}, busy {pool_stats['timeouts']})")
     
     st.markdown("---")
     st.markdown("### ℹ️ About")
@@ -257,21 +304,24 @@ with col1:
     uploaded = st.file_uploader("Choose a hand gesture image...", type=['jpg', 'jpeg', 'png'], label_visibility="collapsed")
     
     if uploaded:
-        image = Image.open(uploaded)
-        st.image(image, caption="Uploaded Image", width=600)
+        image_bytes = uploaded.getvalue()
+        digest = hashlib.sha1(image_bytes).hexdigest()
         
         with st.spinner('Detecting gesture...'):
-            model, le, hands = load_model()
-            label, confidence, annotated = predict_gesture(image, model, le, hands)
+            label, confidence, image, points = detect(digest, image_bytes)
+            new_image = is_new_image('upload', digest)
             
             if label:
-                st.session_state.last_gesture = label
-                st.session_state.detection_count += 1
+                if new_image:
+                    st.session_state.last_gesture = label
+                    st.session_state.detection_count += 1
                 
-                if st.session_state.voice_enabled:
-                    threading.Thread(target=speak_gesture, args=(label,), daemon=True).start()
+                if new_image and st.session_state.voice_enabled:
+                    speak_gesture(label)
                 
-                st.image(annotated, caption="Detected Hand Landmarks", width=600)
+                show_landmarks(image, points, caption="Detected Hand Landmarks", width=600)
+            else:
+                st.image(image, caption="Uploaded Image", width=600)
     else:
         st.info("👆 Upload an image to detect hand gestures")
     
@@ -5,14 +5,18 @@ warnings.filterwarnings('ignore')
 
 import streamlit as st
 import numpy as np
-from PIL import Image
 import mediapipe as mp
-import keras
 import pickle
-import pyttsx3
+import hashlib
 import threading
-import base64
-from io import BytesIO
+from detector_pool import DetectorPool, PoolTimeout
+from image_preprocess import load_image, rgb_array
+from landmark_features import normalize_landmarks
+from landmark_overlay import MODES, PREVIEW_SIDE, draw_landmarks, landmark_points, overlay_html
+from numpy_engine import load_classifier
+from speech import AudioBank, SpeechWorker, make_synthesizer
+
+RESULT_CACHE_ENTRIES = 128
 
 st.set_page_config(page_title="Sign Language Detection", page_icon="🤟", layout="wide", initial_sidebar_state="expanded")
 
@@ -42,88 +46,80 @@ if 'voice_enabled' not in st.session_state:
     st.session_state.voice_enabled = True
 if 'subtitles_enabled' not in st.session_state:
     st.session_state.subtitles_enabled = True
+if 'overlay_mode' not in st.session_state:
+    st.session_state.overlay_mode = 'vector'
 if 'detection_count' not in st.session_state:
     st.session_state.detection_count = 0
 if 'last_gesture' not in st.session_state:
     st.session_state.last_gesture = "None"
 if 'show_camera' not in st.session_state:
     st.session_state.show_camera = False
-if 'voice_available' not in st.session_state:
-    # Check if voice is available
-    try:
-        import pyttsx3
-        engine = pyttsx3.init()
-        engine.stop()
-        st.session_state.voice_available = True
-    except:
-        st.session_state.voice_available = False
-
 @st.cache_resource
 def load_model():
-    model = keras.models.load_model('sign_model.h5')
+    model = load_classifier('sign_model.h5')
     with open('labels.pkl', 'rb') as f:
         le = pickle.load(f)
     mp_hands = mp.solutions.hands
-    hands = mp_hands.Hands(
+    # One Hands graph per concurrent session, up to SIGN_HANDS_POOL (default: core count, at most 4).
+    pool = DetectorPool(lambda: mp_hands.Hands(
         static_image_mode=True, 
         max_num_hands=1, 
         min_detection_confidence=0.5,
         min_tracking_confidence=0.5
-    )
-    return model, le, hands
+    ), size=int(os.environ.get('SIGN_HANDS_POOL', 0)) or None)
+    return model, le, pool
+
+@st.cache_resource
+def get_speech_worker():
+    """One local pyttsx3 engine on its own thread (unavailable on Streamlit Cloud)."""
+    return SpeechWorker(rate=150)
+
+@st.cache_resource
+def load_audio_bank():
+    """Browser audio for every label, generated once and cached in memory and on disk.
+
+    SIGN_TTS picks the synthesizer (gtts by default, pyttsx3 or stub offline).
+    pyttsx3 renders on the speech worker's thread, the only one driving its engine.
+    """
+    _, le, _ = load_model()
+    name = os.environ.get('SIGN_TTS', 'gtts')
+    settings = {'worker': get_speech_worker()} if name == 'pyttsx3' else {}
+    bank = AudioBank(make_synthesizer(name, **settings))
+    threading.Thread(target=bank.pregenerate, args=([str(c) for c in le.classes_],), daemon=True).start()
+    return bank
 
 def speak_gesture(text):
-    """Speak gesture using text-to-speech (only works locally, not on Streamlit Cloud)"""
-    if not st.session_state.voice_available:
-        return
-    try:
-        engine = pyttsx3.init()
-        engine.setProperty('rate', 150)
-        engine.say(text)
-        engine.runAndWait()
-    except Exception as e:
-        # Silently fail if voice not available
-        st.session_state.voice_available = False
+    """Speak gesture with the local voice (only works locally, not on Streamlit Cloud)"""
+    get_speech_worker().say(text)
 
 def speak_gesture_cloud(text):
-    """Generate audio HTML for browser-based text-to-speech using gTTS"""
+    """Audio HTML for browser playback, from the pre-generated audio bank"""
+    bank = load_audio_bank()
     try:
-        from gtts import gTTS
-        # Create audio in memory
-        tts = gTTS(text=text, lang='en', slow=False)
-        audio_bytes = BytesIO()
-        tts.write_to_fp(audio_bytes)
-        audio_bytes.seek(0)
-        
-        # Convert to base64 for HTML embedding
-        audio_base64 = base64.b64encode(audio_bytes.read()).decode()
-        
-        # Create HTML audio element with autoplay
-        audio_html = f"""
+        src = bank.data_uri(text)
+    except Exception:
+        return ""
+    return f"""
         <audio autoplay>
-            <source src="data:audio/mp3;base64,{audio_base64}" type="audio/mp3">
+            <source src="{src}" type="{bank.synthesizer.mime}">
         </audio>
         """
-        return audio_html
-    except:
-        return ""
 
-def normalize_landmarks(hand_landmarks):
-    """Normalize landmarks by translating to wrist and scaling"""
-    pts = np.array([[lm.x, lm.y, lm.z] for lm in hand_landmarks.landmark], dtype=np.float32)
-    wrist = pts[0]
-    pts -= wrist
-    scale = np.max(np.linalg.norm(pts, axis=1))
-    if scale > 0:
-        pts /= scale
-    return pts.flatten()
+def show_landmarks(image, points, caption=None, width=None):
+    """The photo with its hand landmarks, in the sidebar's display mode (landmark_overlay.py)."""
+    mode = st.session_state.overlay_mode
+    if mode == 'vector':
+        st.markdown(overlay_html(image, points, width=width, caption=caption), unsafe_allow_html=True)
+        return
+    annotated = draw_landmarks(image, points, PREVIEW_SIDE if mode == 'preview' else None)
+    if width:
+        st.image(annotated, caption=caption, width=width)
+    else:
+        st.image(annotated, caption=caption, use_container_width=True)
 
 def predict_gesture(image_pil, model, le, hands):
-    img_array = np.array(image_pil)
-    if len(img_array.shape) == 2:
-        img_array = np.stack([img_array] * 3, axis=-1)
-    if img_array.shape[2] == 4:
-        img_array = img_array[:, :, :3]
+    # RGB view of the already downscaled photo (image_preprocess.py)
+    img_array = rgb_array(image_pil)
     
     h, w = img_array.shape[:2]
     res = hands.process(img_array)
@@ -131,8 +127,8 @@ def predict_gesture(image_pil, model, le, hands):
     if res.multi_hand_landmarks:
         hand_landmarks = res.multi_hand_landmarks[0]
         
-        # Normalize landmarks like in live_sign_detect.py
-        landmarks = normalize_landmarks(hand_landmarks)
+        # Same features the model was trained on (landmark_features.py)
+        landmarks = normalize_landmarks(hand_landmarks.landmark)
         landmarks = landmarks.reshape(1, -1)
         
         prediction = model.predict(landmarks, verbose=0)
@@ -147,20 +143,42 @@ def predict_gesture(image_pil, model, le, hands):
         if confidence > 0.50:
             label = le.inverse_transform(predicted_class)[0]
             
-            annotated = img_array.copy()
-            mp_drawing = mp.solutions.drawing_utils
-            mp_drawing_styles = mp.solutions.drawing_styles
-            mp_drawing.draw_landmarks(
-                annotated,
-                hand_landmarks,
-                mp.solutions.hands.HAND_CONNECTIONS,
-                mp_drawing_styles.get_default_hand_landmarks_style(),
-                mp_drawing_styles.get_default_hand_connections_style()
-            )
-            
-            return label, confidence, Image.fromarray(annotated), list(zip(top_3_labels, top_3_confidences))
+            return label, confidence, image_pil, landmark_points(hand_landmarks), list(zip(top_3_labels, top_3_confidences))
     
-    return None, None, image_pil, None
+    return None, None, image_pil, None, None
+
+@st.cache_data(max_entries=RESULT_CACHE_ENTRIES, show_spinner=False)
+def cached_prediction(image_digest, _image_bytes):
+    """`predict_gesture` on an encoded image, cached by its content hash.
+
+    The cache is shared by every session and holds at most
+    RESULT_CACHE_ENTRIES results (the oldest are evicted), so reruns from
+    sidebar toggles, and the same photo uploaded again, skip MediaPipe and
+    the model entirely.
+    """
+    model, le, pool = load_model()
+    image = load_image(_image_bytes)
+    with pool.checkout() as hands:
+        return predict_gesture(image, model, le, hands)
+
+def detect(image_digest, image_bytes):
+    """`cached_prediction`, or a busy message (and stop) if no detector frees up in time."""
+    try:
+        return cached_prediction(image_digest, image_bytes)
+    except PoolTimeout:
+        st.error("⏳ Server busy: every hand detector is in use. Please try again in a moment.")
+        st.stop()
+
+def is_new_image(source, image_digest):
+    """True the first time this session sees `image_digest` from `source`.
+
+    Reruns keep the same image, so counting and speaking only happen here.
+    """
+    key = f'last_image_{source}'
+    if st.session_state.get(key) == image_digest:
+        return False
+    st.session_state[key] = image_digest
+    return True
 
 st.markdown("<h1>🤟 Sign Language Detection System</h1>", unsafe_allow_html=True)
 st.markdown("<h2>Capture Photo or Upload Image for Hand Gesture Recognition</h2>", unsafe_allow_html=True)
@@ -169,10 +187,15 @@ with st.sidebar:
     st.markdown("### ⚙️ Control Panel")
     st.markdown("#### 🎤 Voice Output")
     st.session_state.voice_enabled = st.toggle("Enable Voice", value=st.session_state.voice_enabled)
-    if not st.session_state.voice_available:
+    if not get_speech_worker().available:
         st.warning("🔇 Voice unavailable on cloud. Works when running locally!")
     st.markdown("#### 💬 Show Gesture")
     st.session_state.subtitles_enabled = st.toggle("Show Detected Gesture", value=st.session_state.subtitles_enabled)
+    st.markdown("#### 🖐️ Landmarks")
+    st.session_state.overlay_mode = st.radio(
+        "Landmark display", MODES, index=MODES.index(st.session_state.overlay_mode), horizontal=True,
+        label_visibility="collapsed",
+        help="vector: drawn over the photo in the browser; preview: small annotated copy; full: full-size annotated copy")
     st.markdown("---")
     st.markdown("### 📊 Statistics")
     st.markdown(f"""
@@ -181,6 +204,9 @@ with st.sidebar:
         <div class='stat-label'>Detections</div>
     </div>
     """, unsafe_allow_html=True)
+    pool_stats = load_model()[2].stats()
+    st.caption(f"🧵 Detectors in use: {pool_stats['in_use']}/{pool_stats['size']} "
+               f"(peak {pool_stats['peak_in_use']}, waited {pool_stats['waits']}, busy {pool_stats['timeouts']})")
     st.markdown("---")
     st.markdown("### ℹ️ About")
     st.markdown("""
@@ -207,26 +233,28 @@ with col1:
         if st.session_state.show_camera:
             camera_photo = st.camera_input("Show your hand gesture to camera", label_visibility="collapsed", key="camera_input")
             if camera_photo:
-                image = Image.open(camera_photo)
+                image_bytes = camera_photo.getvalue()
+                digest = hashlib.sha1(image_bytes).hexdigest()
                 st.markdown("<p style='text-align: center; color: #667eea; font-weight: 600; font-size: 18px;'>📸 Captured Photo</p>", unsafe_allow_html=True)
                 
                 with st.spinner('🔍 Detecting gesture...'):
-                    model, le, hands = load_model()
-                    label, confidence, annotated, top_3 = predict_gesture(image, model, le, hands)
+                    label, confidence, image, points, top_3 = detect(digest, image_bytes)
+                    new_image = is_new_image('camera', digest)
                     
                     if label:
-                        st.session_state.last_gesture = label
-                        st.session_state.detection_count += 1
+                        if new_image:
+                            st.session_state.last_gesture = label
+                            st.session_state.detection_count += 1
                         
-                        if st.session_state.voice_enabled:
+                        if new_image and st.session_state.voice_enabled:
                             # Try system voice (local only)
-                            threading.Thread(target=speak_gesture, args=(label,), daemon=True).start()
-                            # Use gTTS for cloud (generates audio file)
+                            speak_gesture(label)
+                            # Browser audio for cloud (pre-generated per label)
                             audio_html = speak_gesture_cloud(label)
                             if audio_html:
                                 st.markdown(audio_html, unsafe_allow_html=True)
                         
-                        st.image(annotated, use_container_width=True)
+                        show_landmarks(image, points)
                         st.success(f"✅ Detected: **{label}** (Confidence: {confidence*100:.1f}%)")
                         
                         if confidence < 0.70:
@@ -251,26 +279,28 @@ with col1:
         uploaded = st.file_uploader("Choose a hand gesture image...", type=['jpg', 'jpeg', 'png'], label_visibility="collapsed")
         
         if uploaded:
-            image = Image.open(uploaded)
+            image_bytes = uploaded.getvalue()
+            digest = hashlib.sha1(image_bytes).hexdigest()
             st.markdown("<p style='text-align: center; color: #667eea; font-weight: 600; font-size: 18px;'>📁 Uploaded Image</p>", unsafe_allow_html=True)
             
             with st.spinner('🔍 Detecting gesture...'):
-                model, le, hands = load_model()
-                label, confidence, annotated, top_3 = predict_gesture(image, model, le, hands)
+                label, confidence, image, points, top_3 = detect(digest, image_bytes)
+                new_image = is_new_image('upload', digest)
                 
                 if label:
-                    st.session_state.last_gesture = label
-                    st.session_state.detection_count += 1
+                    if new_image:
+                        st.session_state.last_gesture = label
+                        st.session_state.detection_count += 1
                     
-                    if st.session_state.voice_enabled:
+                    if new_image and st.session_state.voice_enabled:
                         # Try system voice (local only)
-                        threading.Thread(target=speak_gesture, args=(label,), daemon=True).start()
-                        # Use gTTS for cloud (generates audio file)
+                        speak_gesture(label)
+                        # Browser audio for cloud (pre-generated per label)
                         audio_html = speak_gesture_cloud(label)
                         if audio_html:
                             st.markdown(audio_html, unsafe_allow_html=True)
                     
-                    st.image(annotated, use_container_width=True)
+                    show_landmarks(image, points)
                     st.success(f"✅ Detected: **{label}** (Confidence: {confidence*100:.1f}%)")
                     
                     if confidence < 0.70:
@@ -0,0 +1,39 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('KERAS_BACKEND', 'jax')
+
+# One hand from the benchmark fixture, in MediaPipe's normalized image coordinates.
+POINTS = np.load(os.path.join(ROOT, 'benchmarks', 'fixtures', 'landmarks.npy'))[0]
+
+
+def hand_landmarks(points=POINTS):
+    from mediapipe.framework.formats import landmark_pb2
+    lm = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z in points:
+        lm.landmark.add(x=float(x), y=float(y), z=float(z))
+    return lm
+
+
+class FakeHands:
+    """Stands in for mediapipe Hands: every frame contains `points`."""
+
+    def __init__(self, points=POINTS):
+        self.points = points
+        self.calls = 0
+        self.resets = 0
+        self.shapes = []  # (H, W) of every image processed
+
+    def reset(self):
+        self.resets += 1
+
+    def process(self, rgb):
+        self.calls += 1
+        self.shapes.append(rgb.shape[:2])
+        side = SimpleNamespace(classification=[SimpleNamespace(label='Right', score=0.99)])
+        return SimpleNamespace(multi_hand_landmarks=[hand_landmarks(self.points)], multi_handedness=[side])
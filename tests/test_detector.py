@@ -0,0 +1,126 @@
+"""Detector per-stream state: tracking, ROI and resets between streams."""
+import cv2
+import numpy as np
+import pytest
+
+from conftest import POINTS, FakeHands
+
+
+def textured_frame(width, height, seed=0):
+    small = np.random.default_rng(seed).integers(0, 256, (height // 8, width // 8, 3), dtype=np.uint8)
+    return cv2.resize(small, (width, height), interpolation=cv2.INTER_LINEAR)
+
+
+@pytest.fixture
+def make_detector():
+    from live_sign_detect import Detector
+
+    def make(**kwargs):
+        detector = Detector(**kwargs)
+        detector.hands = FakeHands()
+        return detector
+    return make
+
+
+@pytest.mark.parametrize('kwargs', [{'keyframe_interval': 3}, {'roi_padding': 0.5},
+                                    {'keyframe_interval': 3, 'roi_padding': 0.5}])
+def test_frame_size_change_falls_back_to_full_detection(make_detector, kwargs):
+    detector = make_detector(**kwargs)
+    big, small = textured_frame(640, 480), textured_frame(320, 240)
+    assert detector.predict(big, annotate=False)[0] is not None
+    keyframes, roi_hits = detector.stats['keyframes'], detector.stats['roi_hits']
+
+    label, _, _ = detector.predict(small, annotate=False)
+    assert label is not None
+    assert detector.stats['keyframes'] == keyframes + 1
+    assert detector.stats['roi_hits'] == roi_hits  # the old frame's crop is not reused
+    assert detector._prev_gray is None or detector._prev_gray.shape == small.shape[:2]
+    if detector._roi is not None:
+        x0, y0, x1, y1 = detector._roi
+        assert x1 <= 320 and y1 <= 240
+
+
+def test_same_size_frames_are_tracked(make_detector):
+    detector = make_detector(keyframe_interval=3)
+    frame = textured_frame(640, 480)
+    for _ in range(3):
+        detector.predict(frame, annotate=False)
+    assert detector.stats['keyframes'] == 1 and detector.stats['tracked'] == 2
+
+
+def test_reset_clears_stream_state(make_detector):
+    detector = make_detector(keyframe_interval=3, roi_padding=0.5, memo_threshold=0.05)
+    detector.predict(textured_frame(640, 480), annotate=False)
+    assert detector._track is not None and detector.buffer
+
+    detector.reset()
+    assert detector.hands.resets == 1
+    assert not detector.buffer and not detector.hand_buffers
+    assert detector._track is None and detector._prev_gray is None and detector._roi is None
+    assert detector._memo is None and detector.last_landmarks is None
+
+
+def test_batch_videos_of_different_sizes(make_detector, tmp_path):
+    import batch_detect
+
+    paths = []
+    for i, (w, h) in enumerate([(640, 480), (320, 240)]):
+        path = str(tmp_path / f'{i}.avi')
+        out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 10, (w, h))
+        for j in range(4):
+            out.write(textured_frame(w, h, seed=j))
+        out.release()
+        paths.append(path)
+
+    detector = make_detector(keyframe_interval=3)
+    writer = batch_detect.RecordWriter(str(tmp_path / 'out.jsonl'))
+    try:
+        counts = [batch_detect.process_input(detector, path, writer) for path in paths]
+    finally:
+        writer.close()
+    assert counts == [4, 4]
+    assert detector.hands.resets == 2
+    # Each video starts with a full detection of its own.
+    assert detector.stats['keyframes'] >= 2
+
+
+class FlakyHands(FakeHands):
+    """Finds the hand except on the calls listed in `misses` (1-based)."""
+
+    def __init__(self, misses=()):
+        super().__init__()
+        self.misses = set(misses)
+
+    def process(self, rgb):
+        result = super().process(rgb)
+        if self.calls in self.misses:
+            result.multi_hand_landmarks = None
+        return result
+
+
+def test_roi_crops_bypass_the_video_tracker(make_detector):
+    # crop hit -> crop miss + full retry -> crop hit: the video graph's prior
+    # stays in full-frame coordinates because it never sees a crop.
+    detector = make_detector(roi_padding=0.5)
+    detector._static_hands = FlakyHands(misses={2})
+    frame = textured_frame(640, 480)
+    for _ in range(4):
+        assert detector.predict(frame, annotate=False)[0] is not None
+
+    assert detector.hands.shapes == [(480, 640)]
+    static = detector._static_hands.shapes
+    assert len(static) == 4 and static[2] == (480, 640)
+    assert all(shape != (480, 640) for i, shape in enumerate(static) if i != 2)
+    assert detector.stats['roi_hits'] == 2 and detector.stats['roi_misses'] == 1
+
+
+def test_detect_then_apply_results_matches_predict(make_detector):
+    a, b = make_detector(), make_detector()
+    labels, confs = b.classify_raw(POINTS[None])
+    frame = textured_frame(640, 480)
+    for _ in range(3):
+        label, conf, _ = a.predict(frame, annotate=False)
+        hands = b.detect_landmarks(frame)
+        assert b.apply_results(hands, [(labels[0, 0], float(confs[0, 0]))]) == (label, pytest.approx(conf))
+    assert list(a.buffer) == list(b.buffer) and len(b.last_hands) == 1
+    assert b.apply_results([], []) == (None, 0.0) and b.last_hands == []
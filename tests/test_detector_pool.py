@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+
+from detector_pool import MAX_DEFAULT_SIZE, DetectorPool, PoolTimeout
+
+
+class FakeGraph:
+    """Fails if two callers run `process` at once, like a Hands graph must not."""
+
+    def __init__(self):
+        self.busy = threading.Lock()
+        self.calls = 0
+        self.closed = False
+
+    def process(self, rgb):
+        assert not self.closed, 'closed graph used'
+        assert self.busy.acquire(blocking=False), 'graph used concurrently'
+        try:
+            time.sleep(0.002)
+            self.calls += 1
+        finally:
+            self.busy.release()
+
+    def close(self):
+        self.closed = True
+
+
+def test_threads_never_share_a_graph():
+    graphs = []
+    pool = DetectorPool(lambda: graphs.append(FakeGraph()) or graphs[-1], size=3)
+    errors = []
+
+    def run():
+        try:
+            for _ in range(20):
+                with pool.checkout() as graph:
+                    graph.process(None)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    stats = pool.stats()
+    assert len(graphs) == 3 and stats['peak_in_use'] <= 3 and stats['in_use'] == 0
+    assert sum(g.calls for g in graphs) == 160 and stats['checkouts'] == 160
+
+
+def test_timeout_when_all_busy():
+    pool = DetectorPool(FakeGraph, size=1, timeout=0.05)
+    held = pool.acquire()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+    pool.release(held)
+    assert pool.acquire() is held
+    assert pool.stats()['timeouts'] == 1
+
+
+def test_waiters_are_served_in_order():
+    pool = DetectorPool(FakeGraph, size=1)
+    held = pool.acquire()
+    order = []
+
+    def wait(i):
+        pool.release(pool.acquire())
+        order.append(i)
+
+    threads = []
+    for i in range(4):
+        threads.append(threading.Thread(target=wait, args=(i,)))
+        threads[-1].start()
+        while pool.stats()['waits'] <= i:
+            time.sleep(0.001)
+    pool.release(held)
+    for t in threads:
+        t.join()
+    assert order == [0, 1, 2, 3]
+
+
+def test_broken_graph_is_replaced():
+    pool = DetectorPool(FakeGraph, size=1)
+    with pytest.raises(ValueError):
+        with pool.checkout() as first:
+            raise ValueError
+    assert first.closed
+    with pool.checkout() as second:
+        assert second is not first
+    assert pool.stats()['replaced'] == 1
+
+
+def test_close_closes_checked_out_graphs_on_release():
+    pool = DetectorPool(FakeGraph, size=2)
+    idle, busy = pool.acquire(), pool.acquire()
+    pool.release(idle)
+    pool.close()
+    assert idle.closed and not busy.closed
+
+    pool.release(busy)
+    assert busy.closed
+    assert pool.stats()['idle'] == 0 and pool.stats()['created'] == 0
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+
+def test_default_size_is_capped():
+    assert 1 <= DetectorPool(FakeGraph).size <= MAX_DEFAULT_SIZE
@@ -0,0 +1,89 @@
+"""Every entry point must feed the model the features it was trained on.
+
+The same hand is pushed through each entry point's real feature path (with
+MediaPipe replaced by a fake that returns it, and the model by one that
+records its input) and the vectors must equal the training-time
+normalize_batch of the raw coordinates.
+"""
+import logging
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from conftest import POINTS, FakeHands
+from landmark_features import FEATURE_DIM, normalize_batch
+
+EXPECTED = normalize_batch(POINTS)[0]
+FRAME = np.zeros((480, 640, 3), np.uint8)
+
+
+class RecordingModel:
+    """Stands in for the classifier and keeps every input it is given."""
+
+    def __init__(self, n_classes=37):
+        self.inputs = []
+        self.n_classes = n_classes
+
+    def predict(self, x, verbose=0):
+        x = np.asarray(x, dtype=np.float32).reshape(-1, FEATURE_DIM)
+        self.inputs.append(x.copy())
+        probs = np.full((len(x), self.n_classes), 0.1 / self.n_classes, np.float32)
+        probs[:, 0] += 0.9
+        return probs
+
+
+class FakeEncoder:
+    def inverse_transform(self, idx):
+        return np.asarray([str(i) for i in np.ravel(idx)])
+
+
+@pytest.fixture(scope='module')
+def detector():
+    from live_sign_detect import Detector
+    return Detector()
+
+
+def test_detector_predict(detector):
+    model = RecordingModel(len(detector.classes))
+    detector.hands, detector._forward = FakeHands(), model.predict
+    detector.predict(FRAME, annotate=False)
+    np.testing.assert_allclose(model.inputs[-1][0], EXPECTED, atol=1e-6)
+
+
+def test_detector_classify_raw(detector):
+    model = RecordingModel(len(detector.classes))
+    detector._forward = model.predict
+    detector.classify_raw(POINTS[None])
+    np.testing.assert_allclose(model.inputs[-1][0], EXPECTED, atol=1e-6)
+
+
+@pytest.mark.parametrize('app', ['streamlit_app', 'streamlit_photo_app'])
+def test_streamlit_predict_gesture(app):
+    import importlib
+    import streamlit  # noqa: F401
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith('streamlit'):
+            logging.getLogger(name).setLevel(logging.ERROR)
+    module = importlib.import_module(app)
+    model = RecordingModel()
+    module.predict_gesture(Image.fromarray(FRAME), model, FakeEncoder(), FakeHands())
+    np.testing.assert_allclose(model.inputs[-1][0], EXPECTED, atol=1e-6)
+
+
+def test_inference_server_worker(monkeypatch):
+    import inference_server
+    monkeypatch.setattr(inference_server, '_hands', FakeHands())
+    vec = inference_server.detect_features(cv2.imencode('.png', FRAME)[1].tobytes())
+    np.testing.assert_allclose(vec, EXPECTED, atol=1e-6)
+
+
+def test_training_rows(monkeypatch, tmp_path):
+    # extract_landmarks stores raw coordinates; training normalizes them with normalize_batch.
+    import extract_landmarks
+    monkeypatch.setattr(extract_landmarks, '_hands', FakeHands(), raising=False)
+    path = str(tmp_path / 'hand.png')
+    cv2.imwrite(path, FRAME)
+    row = extract_landmarks.extract(path)
+    np.testing.assert_allclose(normalize_batch(np.asarray(row, np.float32))[0], EXPECTED, atol=1e-6)
@@ -0,0 +1,50 @@
+import asyncio
+
+import numpy as np
+
+from conftest import ROOT
+
+
+def test_small_classify_requests_are_micro_batched():
+    from inference_server import InferenceServer
+    from live_sign_detect import Detector
+
+    detector = Detector()
+    server = InferenceServer(detector, workers=1, max_batch=64, max_wait=0.05)
+    hands = np.load(f'{ROOT}/benchmarks/fixtures/landmarks.npy')[:32]
+
+    async def run():
+        server.batcher.start()
+        return await asyncio.gather(*[
+            server.handle_classify(hand.astype('<f4').tobytes(), {}, {'top_k': ['3']}) for hand in hands])
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        server.pool.shutdown()
+    stats = server.batcher.stats()
+    assert stats['items'] == 32 and stats['batches'] < 32
+
+    labels, confs = detector.classify_raw(hands, top_k=3)
+    assert [r['labels'][0] for r in results] == labels.astype(str).tolist()
+    np.testing.assert_allclose([r['confidences'][0] for r in results], confs, atol=1e-5)
+
+
+def test_workers_use_the_detector_threshold(monkeypatch):
+    import inference_server
+    from inference_server import InferenceServer
+    from live_sign_detect import Detector
+
+    server = InferenceServer(Detector(min_detection_confidence=0.6), workers=1)
+    server.pool.shutdown()
+    assert server.min_detection_confidence == 0.6
+
+    # What each worker process runs at startup with that threshold.
+    import cv2
+    import mediapipe as mp
+    built = []
+    monkeypatch.setattr(mp.solutions.hands, 'Hands', lambda **kwargs: built.append(kwargs))
+    monkeypatch.setattr(cv2, 'setNumThreads', lambda n: None)
+    monkeypatch.setattr(inference_server, '_hands', None)
+    inference_server._init_worker(server.min_detection_confidence)
+    assert built[0]['min_detection_confidence'] == 0.6
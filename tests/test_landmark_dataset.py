@@ -0,0 +1,41 @@
+import os
+
+import numpy as np
+
+from landmark_dataset import binary_is_stale, load_training_data, write_dataset
+from landmark_features import normalize_batch
+
+
+def _write_csv(path, labels, coords):
+    import pandas as pd
+    df = pd.DataFrame(np.asarray(coords).reshape(len(labels), 63))
+    df.insert(0, 'label', labels)
+    df.to_csv(path, index=False)
+
+
+def test_binary_dataset_preferred_when_fresh(tmp_path):
+    rng = np.random.default_rng(0)
+    csv_path, binary = str(tmp_path / 'data.csv'), str(tmp_path / 'data')
+    _write_csv(csv_path, ['A', 'B'], rng.random((2, 63)))
+    coords = rng.random((3, 63)).astype(np.float32)
+    write_dataset(['A', 'B', 'B'], coords, binary)
+
+    X, y, classes = load_training_data(binary, csv_path)
+    assert not binary_is_stale(binary, csv_path)
+    assert len(X) == 3 and classes == ['A', 'B']
+    np.testing.assert_allclose(X, normalize_batch(coords), atol=1e-6)
+
+
+def test_newer_csv_wins_over_stale_binary(tmp_path):
+    rng = np.random.default_rng(1)
+    csv_path, binary = str(tmp_path / 'data.csv'), str(tmp_path / 'data')
+    write_dataset(['A', 'B', 'B'], rng.random((3, 63)), binary)
+    coords = rng.random((4, 63))
+    _write_csv(csv_path, ['A', 'B', 'C', 'C'], coords)
+    old = os.stat(os.path.join(binary, 'landmarks.npy')).st_mtime_ns - 10 ** 9
+    os.utime(os.path.join(binary, 'landmarks.npy'), ns=(old, old))
+
+    X, y, classes = load_training_data(binary, csv_path)
+    assert binary_is_stale(binary, csv_path)
+    assert len(X) == 4 and list(classes) == ['A', 'B', 'C']
+    np.testing.assert_allclose(X, normalize_batch(coords), atol=1e-6)
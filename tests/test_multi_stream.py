@@ -0,0 +1,31 @@
+import numpy as np
+
+from conftest import POINTS, FakeHands
+
+
+def test_streams_share_one_model_and_build_no_extra_hands(monkeypatch):
+    import live_sign_detect
+    from multi_stream import MultiStreamRunner
+
+    built = []
+    real_hands = live_sign_detect.mp.solutions.hands.Hands
+
+    def counting_hands(*args, **kwargs):
+        built.append(kwargs)
+        return real_hands(*args, **kwargs)
+    monkeypatch.setattr(live_sign_detect.mp.solutions.hands, 'Hands', counting_hands)
+
+    runner = MultiStreamRunner(['a.mp4', 'b.mp4', 'c.mp4'])
+    assert len(built) == 3
+    assert all(s.detector.model is runner.classifier.model for s in runner.streams)
+
+    for stream in runner.streams:
+        stream.detector.hands = FakeHands()
+        stream.frames.put(np.zeros((240, 320, 3), np.uint8))
+    served = runner.tick()
+    assert len(served) == 3 and runner.batches == 1
+    label = runner.classifier.classify_raw(POINTS[None])[0][0, 0]
+    assert all(s.label == label for s in served)
+    # Smoothing goes through the Detector itself, exactly as in predict.
+    for s in served:
+        assert list(s.detector.buffer) == [label] and s.detector.last_hands[0][1] == label
@@ -0,0 +1,60 @@
+"""The NumPy engine must give the same probabilities as the Keras model it was exported from."""
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from conftest import ROOT
+from export_weights import check_parity, export_weights
+from numpy_engine import NumpyClassifier, load_classifier
+
+
+@pytest.fixture(scope='module')
+def small_model():
+    import keras
+    from keras import layers
+    keras.utils.set_random_seed(0)
+    model = keras.Sequential([layers.Input(shape=(63,)), layers.Dense(32, activation='relu'),
+                              layers.Dropout(0.3), layers.Dense(16, activation='relu'),
+                              layers.Dense(5, activation='softmax')])
+    return model
+
+
+def test_numpy_matches_keras(small_model, tmp_path):
+    path = export_weights(small_model, list('ABCDE'), str(tmp_path / 'w.npz'))
+    x = np.random.default_rng(1).uniform(-1, 1, (256, 63)).astype(np.float32)
+
+    clf = NumpyClassifier(path)
+    np.testing.assert_allclose(clf.predict(x), small_model.predict(x, verbose=0), atol=1e-5)
+    assert list(clf.classes) == list('ABCDE')
+    assert check_parity(small_model, path) <= 1e-5
+
+
+@pytest.fixture
+def stale_labels(tmp_path):
+    """labels.pkl with the classes in another order than the exported weights."""
+    labels = tmp_path / 'labels.pkl'
+    with open(os.path.join(ROOT, 'labels.pkl'), 'rb') as f:
+        le = pickle.load(f)
+    le.classes_ = le.classes_[::-1]
+    labels.write_bytes(pickle.dumps(le))
+    return str(labels)
+
+
+WEIGHTS = os.path.join(ROOT, 'sign_model_weights.npz')
+
+
+def test_detector_rejects_stale_labels(stale_labels):
+    from live_sign_detect import Detector
+
+    with pytest.raises(ValueError, match='do not match'):
+        Detector(labels_path=stale_labels, weights_path=WEIGHTS, engine='numpy')
+    Detector(labels_path=None, weights_path=WEIGHTS, engine='numpy')
+
+
+def test_load_classifier_rejects_stale_labels(stale_labels):
+    with pytest.raises(ValueError, match='do not match'):
+        load_classifier(weights_path=WEIGHTS, labels_path=stale_labels)
+    clf = load_classifier(weights_path=WEIGHTS, labels_path=os.path.join(ROOT, 'labels.pkl'))
+    assert isinstance(clf, NumpyClassifier)
@@ -0,0 +1,130 @@
+import threading
+import time
+
+from speech import AudioBank, Pyttsx3Synthesizer, SpeechWorker, StubSynthesizer
+
+LABELS = ['A', 'B', 'hello', 'thank you']
+
+
+class CountingStub(StubSynthesizer):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def synthesize(self, text):
+        self.calls.append(text)
+        return super().synthesize(text)
+
+
+def test_bank_generates_each_label_once(tmp_path):
+    synth = CountingStub()
+    bank = AudioBank(synth, cache_dir=str(tmp_path))
+    assert bank.pregenerate(LABELS + LABELS) == 0
+    assert sorted(synth.calls) == sorted(LABELS)
+    assert bank.misses == len(LABELS) and bank.hits == len(LABELS)
+
+    # Served from memory: no new synthesis, same bytes, cached data URI.
+    assert bank.get('A') == StubSynthesizer().synthesize('A')
+    uri = bank.data_uri('hello')
+    assert uri.startswith('data:audio/wav;base64,') and bank.data_uri('hello') is uri
+    assert len(synth.calls) == len(LABELS)
+
+
+def test_bank_is_reloaded_from_disk(tmp_path):
+    AudioBank(CountingStub(), cache_dir=str(tmp_path)).pregenerate(LABELS)
+
+    synth = CountingStub()
+    bank = AudioBank(synth, cache_dir=str(tmp_path))
+    assert bank.pregenerate(LABELS) == 0
+    assert synth.calls == []
+    assert bank.get('B') == StubSynthesizer().synthesize('B')
+
+    # Other settings get their own directory instead of the stale audio.
+    other = CountingStub()
+    other.settings['duration'] = 0.1
+    AudioBank(other, cache_dir=str(tmp_path)).get('B')
+    assert other.calls == ['B']
+
+
+class SlowStub(CountingStub):
+    """Blocks synthesizing 'slow' until `release` is set."""
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def synthesize(self, text):
+        if text == 'slow':
+            self.started.set()
+            assert self.release.wait(5)
+        return super().synthesize(text)
+
+
+def test_lookups_do_not_wait_behind_other_labels(tmp_path):
+    synth = SlowStub()
+    bank = AudioBank(synth, cache_dir=str(tmp_path))
+    results = []
+    waiters = [threading.Thread(target=lambda: results.append(bank.get('slow'))) for _ in range(3)]
+    for t in waiters:
+        t.start()
+    assert synth.started.wait(5)
+
+    # Another label is served while 'slow' is still being synthesized.
+    assert bank.data_uri('fast').startswith('data:audio/wav;base64,')
+    assert not synth.release.is_set()
+
+    synth.release.set()
+    for t in waiters:
+        t.join()
+    assert len(set(results)) == 1 and synth.calls.count('slow') == 1
+    assert bank.misses == 2 and bank.hits == 2
+
+
+class FakeEngine:
+    """pyttsx3-like engine that fails if two threads drive it at once."""
+
+    def __init__(self):
+        self.busy = threading.Lock()
+        self.threads = set()
+        self.spoken = []
+        self._queued = []
+
+    def say(self, text):
+        self._queued.append(('say', text, None))
+
+    def save_to_file(self, text, path):
+        self._queued.append(('save', text, path))
+
+    def runAndWait(self):
+        assert self.busy.acquire(blocking=False), 'engine used concurrently'
+        try:
+            self.threads.add(threading.get_ident())
+            time.sleep(0.005)
+            for kind, text, path in self._queued:
+                if kind == 'save':
+                    with open(path, 'wb') as f:
+                        f.write(text.encode())
+                else:
+                    self.spoken.append(text)
+            self._queued = []
+        finally:
+            self.busy.release()
+
+    def stop(self):
+        pass
+
+
+def test_pyttsx3_renders_on_the_speech_worker_thread(tmp_path):
+    engine = FakeEngine()
+    worker = SpeechWorker(engine_factory=lambda: engine, maxsize=8)
+    try:
+        bank = AudioBank(Pyttsx3Synthesizer(worker=worker), cache_dir=str(tmp_path))
+        speaker = threading.Thread(target=lambda: [worker.say(l) or time.sleep(0.002) for l in LABELS * 3])
+        speaker.start()
+        assert bank.pregenerate(LABELS) == 0
+        speaker.join()
+        assert bank.get('hello') == b'hello'
+    finally:
+        worker.close()
+    assert len(engine.threads) == 1
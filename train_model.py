@@ -1,38 +1,26 @@
-import numpy as np
-import pandas as pd
 import keras
 from keras import layers
-from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
 from keras.utils import to_categorical
 import pickle
+from export_weights import export_weights
+from quantize_model import MODES, quantize
+from landmark_dataset import held_out_split, load_training_data
 
-df = pd.read_csv('landmarks_dataset.csv')
-labels = df['label'].values
-X = df.drop(columns=['label']).values.astype('float32')
+# Prefers the binary dataset (extract_landmarks.py --format binary): it is
+# memory-mapped and its normalized features are cached between runs.
+X, y, classes = load_training_data()
+le = LabelEncoder().fit(classes)
 
-def normalize_sample(s):
-    pts = s.reshape(-1,3)
-    wrist = pts[0]
-    pts -= wrist
-    scale = np.max(np.linalg.norm(pts, axis=1))
-    if scale > 0:
-        pts /= scale
-    return pts.flatten()
-
-X = np.array([normalize_sample(x) for x in X])
-
-le = LabelEncoder()
-y = le.fit_transform(labels)
-y = to_categorical(y)
-
-X_train, X_val, y_train, y_val = train_test_split(X, y, test_size=0.2, stratify=y)
+# Fixed seed, so tools like quantize_model.py can score on the same rows.
+X_train, X_val, y_train, y_val = held_out_split(X, y)
+y_train, y_val = to_categorical(y_train, len(classes)), to_categorical(y_val, len(classes))
 
 inp = layers.Input(shape=(X.shape[1],))
 x = layers.Dense(256, activation='relu')(inp)
 x = layers.Dropout(0.3)(x)
 x = layers.Dense(128, activation='relu')(x)
-out = layers.Dense(y.shape[1], activation='softmax')(x)
+out = layers.Dense(len(classes), activation='softmax')(x)
 
 model = keras.Model(inp, out)
 model.compile(optimizer='adam', loss='categorical_crossentropy', metrics=['accuracy'])
@@ -42,5 +30,8 @@ model.fit(X_train, y_train, validation_data=(X_val, y_val), epochs=100, batch_si
 model.save('sign_model.h5')
 with open('labels.pkl','wb') as f:
     pickle.dump(le, f)
+export_weights(model, le.classes_, 'sign_model_weights.npz')
+for mode in MODES:
+    quantize('sign_model_weights.npz', mode)
 
 print("✅ Model trained and saved!")